@@ -0,0 +1,87 @@
+"""In-process LRU/TTL cache for read-only API responses.
+
+Keys combine the endpoint, its query parameters and the catalog generation
+(:mod:`backend.db.generation`), so a write simply makes old entries
+unreachable; they age out through LRU/TTL.  Responses carry a weak ETag
+derived from the same key, and a matching ``If-None-Match`` is answered with
+``304 Not Modified`` before any work is done.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from fastapi import Request, Response
+
+from backend.config import API_CACHE_SIZE, API_CACHE_TTL
+from backend.db.generation import catalog_generation
+
+
+class ResponseCache:
+    """Thread-safe LRU with per-entry TTL."""
+
+    def __init__(self, maxsize: int = API_CACHE_SIZE, ttl: float = API_CACHE_TTL):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, Tuple[float, bytes]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[bytes]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._data[key]
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: Hashable, value: bytes) -> None:
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+response_cache = ResponseCache()
+
+
+def _etag(namespace: str, params: Dict[str, Any], generation: str) -> str:
+    digest = hashlib.sha1(
+        json.dumps([namespace, params], sort_keys=True, default=str).encode("utf-8")
+    ).hexdigest()[:16]
+    return f'W/"g{generation}-{digest}"'
+
+
+def cached_json(request: Request,
+                namespace: str,
+                params: Dict[str, Any],
+                compute: Callable[[], Any],
+                cache: ResponseCache = response_cache) -> Response:
+    """Serve ``compute()`` as JSON through the cache with ETag revalidation."""
+    generation = catalog_generation()
+    etag = _etag(namespace, params, generation)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if_none_match = request.headers.get("if-none-match", "")
+    if etag in (t.strip() for t in if_none_match.split(",")):
+        return Response(status_code=304, headers=headers)
+
+    key = (namespace, json.dumps(params, sort_keys=True, default=str), generation)
+    body = cache.get(key)
+    if body is None:
+        body = json.dumps(compute(), default=str).encode("utf-8")
+        cache.set(key, body)
+    return Response(content=body, media_type="application/json", headers=headers)
@@ -1,13 +1,26 @@
 # backend/api/routes.py
-from fastapi import APIRouter, HTTPException, Query, BackgroundTasks
+from fastapi import APIRouter, HTTPException, Query, BackgroundTasks, Request
+from fastapi.responses import StreamingResponse, FileResponse
 import asyncio
 import pathlib, json
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import Optional, List
 
+from pydantic import BaseModel, Field
+
 from backend.ingestion.scheduler.async_bridge import async_scrape
+from backend.ingestion.instagram_ingestion.post_ingest import ingest_posts
 from backend.ingestion.metadata.metadata_utils import insert_metadata_to_db
-from backend.config import MAX_NEW_VIDEOS_PER_RUN
+from backend.config import MAX_NEW_VIDEOS_PER_RUN, TRACE_API, TRACE_KEEP
+from backend.api.cache import cached_json
+from backend.db.export import stream_catalog
+from backend.db.stats import fetch_stats
+from backend.db.db import CATALOG_COLUMNS, decode_cursor, fetch_metadata_page, get_connection
+from backend.ingestion.scheduler.adaptive import force_poll, init_schedule_tables, schedule_snapshot
+from backend.ingestion.scheduler import scheduler_app
+from backend.media.previews import get_preview_service, preview_urls
+from backend.media.retention import run_retention_sweep, set_pinned
+from backend.tracing import start_trace, API_TRACE, TRACE_DIR
 
 router = APIRouter()
 LOG_DIR = pathlib.Path("logs"); LOG_DIR.mkdir(exist_ok=True)
@@ -29,19 +42,39 @@ async def _run_scrape(username: str, max_downloads: int):
         return
     async with lock:
         started = datetime.utcnow().isoformat()
-        posts = await async_scrape(username, max_downloads)
-        for p in posts:
-            insert_metadata_to_db(p)
+        run_id = f"{username}_{int(datetime.utcnow().timestamp())}"
+        with start_trace(f"scrape:{username}") as trace:
+            posts = await async_scrape(username, max_downloads)
+            for p in posts:
+                insert_metadata_to_db(p)
         finished = datetime.utcnow().isoformat()
+        trace_file = trace.write(TRACE_DIR / f"{run_id}.json", keep=TRACE_KEEP)
         summary = {
             "status": "success",
             "downloaded": len(posts),
             "started": started,
             "finished": finished,
+            "trace": trace_file.name,
         }
-        run_file = LOG_DIR / f"{username}_{int(datetime.utcnow().timestamp())}.json"
+        run_file = LOG_DIR / f"{run_id}.json"
         run_file.write_text(json.dumps(summary, indent=2))
 
+class PostBatchRequest(BaseModel):
+    items: List[str] = Field(..., min_length=1, max_length=100, description="Post/reel URLs or shortcodes")
+    username: Optional[str] = Field(None, description="Account the posts belong to (used for author + layout)")
+    concurrency: int = Field(4, ge=1, le=8)
+    skip_ffprobe: bool = False
+
+# Declared before /ingest/instagram/{username} so that "posts" is not taken as a username.
+@router.post("/ingest/instagram/posts")
+async def ingest_post_batch(req: PostBatchRequest):
+    """Ingest specific posts without crawling the profile; returns per-item status."""
+    with start_trace("ingest:posts") as trace:
+        results = await ingest_posts(req.items, req.username, req.concurrency, skip_ffprobe=req.skip_ffprobe)
+    if TRACE_API:
+        trace.write(TRACE_DIR / f"posts_{int(datetime.utcnow().timestamp())}.json", keep=TRACE_KEEP)
+    return {"results": results}
+
 @router.post("/ingest/instagram/{username}")
 async def ingest_now(
     username: str,
@@ -52,3 +85,164 @@ async def ingest_now(
     md = max_downloads if max_downloads is not None else MAX_NEW_VIDEOS_PER_RUN
     bg.add_task(_run_scrape, username, md)
     return {"status": "accepted", "username": username, "max_downloads": md}
+
+PREVIEW_FIELDS = ("thumbnail_url", "preview_url")
+
+@router.get("/metadata")
+def list_metadata(
+    request: Request,
+    limit: int = Query(50, ge=1, le=500),
+    offset: int = Query(0, ge=0),
+    source_type: Optional[str] = Query(None),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page (keyset pagination)"),
+    fields: Optional[str] = Query(None, description="Comma-separated columns to return"),
+    compact: bool = Query(False, description="Return {fields, rows} arrays instead of objects"),
+):
+    """Paged catalog listing; each record carries its cached thumbnail/preview URLs.
+
+    Pages can be walked with ``offset`` or, cheaper for deep scrolling, by
+    passing back ``next_cursor``.  ``fields`` + ``compact`` keep the payload to
+    the columns the client actually renders.
+    """
+    if cursor:
+        try:
+            decode_cursor(cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    wanted = None
+    if fields:
+        wanted = list(dict.fromkeys(f.strip() for f in fields.split(",") if f.strip()))
+        unknown = [f for f in wanted if f not in CATALOG_COLUMNS and f not in PREVIEW_FIELDS]
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"unknown fields: {', '.join(unknown)}")
+
+    def compute():
+        with_previews = wanted is None or any(f in PREVIEW_FIELDS for f in wanted)
+        db_fields = None
+        if wanted is not None:
+            db_fields = [f for f in wanted if f in CATALOG_COLUMNS]
+            if with_previews:
+                db_fields += ["file_path", "preview_key"]
+        page = fetch_metadata_page(limit, offset, source_type, cursor=cursor, fields=db_fields)
+        records = page["rows"]
+        if with_previews:
+            for r in records:
+                r.update(preview_urls(r.get("file_path"), r.get("preview_key")))
+        if compact:
+            names = wanted or (list(records[0]) if records else [])
+            return {
+                "fields": names,
+                "rows": [[r.get(f) for f in names] for r in records],
+                "limit": limit,
+                "next_cursor": page["next_cursor"],
+            }
+        if wanted is not None:
+            records = [{f: r.get(f) for f in wanted} for r in records]
+        return {"records": records, "limit": limit, "offset": offset, "next_cursor": page["next_cursor"]}
+
+    params = {"limit": limit, "offset": offset, "source_type": source_type,
+              "cursor": cursor, "fields": wanted, "compact": compact}
+    return cached_json(request, "metadata", params, compute)
+
+@router.get("/metadata/export")
+def export_metadata(
+    since: Optional[str] = Query(None, description="Only rows with ingest_date greater than this value"),
+    after_id: Optional[str] = Query(None, description="With since: resume after this id within the same ingest_date"),
+    source_type: Optional[str] = Query(None),
+    gzip: bool = Query(False, description="Gzip-compress the NDJSON stream"),
+):
+    """Stream the whole catalog as NDJSON, ordered by (ingest_date, id) ASC.
+
+    Resume an incremental pull with the last row's ``ingest_date`` and ``id``.
+    """
+    if after_id and not since:
+        raise HTTPException(status_code=400, detail="after_id requires since")
+    chunks = stream_catalog(since=since, after_id=after_id, source_type=source_type, gzip=gzip)
+    if gzip:
+        return StreamingResponse(
+            chunks,
+            media_type="application/gzip",
+            headers={"Content-Disposition": 'attachment; filename="catalog.ndjson.gz"'},
+        )
+    return StreamingResponse(chunks, media_type="application/x-ndjson")
+
+@router.get("/stats")
+def catalog_stats(
+    request: Request,
+    days: int = Query(30, ge=1, le=3650, description="Days of per-day rollups to return"),
+    author: Optional[str] = Query(None),
+):
+    """Dashboard statistics served from the incrementally maintained rollups."""
+    since_day = (datetime.utcnow() - timedelta(days=days - 1)).strftime("%Y-%m-%d")
+    return cached_json(
+        request, "stats", {"since_day": since_day, "author": author},
+        lambda: fetch_stats(since_day=since_day, author=author),
+    )
+
+@router.post("/metadata/{source_id}/pin")
+def pin_item(source_id: str):
+    """Protect an item's video from retention eviction."""
+    if not set_pinned(source_id, True):
+        raise HTTPException(status_code=404, detail="unknown id")
+    return {"id": source_id, "pinned": True}
+
+@router.delete("/metadata/{source_id}/pin")
+def unpin_item(source_id: str):
+    if not set_pinned(source_id, False):
+        raise HTTPException(status_code=404, detail="unknown id")
+    return {"id": source_id, "pinned": False}
+
+@router.get("/schedule")
+def get_schedule():
+    """Adaptive polling state per account (current interval, last/next run)."""
+    conn = get_connection()
+    try:
+        init_schedule_tables(conn)
+        return {"accounts": schedule_snapshot(conn)}
+    finally:
+        conn.close()
+
+@router.post("/schedule/{username}/force")
+def force_schedule(username: str):
+    """Make *username* due immediately; the next scheduler tick scrapes it."""
+    if username not in scheduler_app.ACCOUNTS:
+        raise HTTPException(status_code=404, detail=f"{username} is not a scheduled account")
+    conn = get_connection()
+    try:
+        init_schedule_tables(conn)
+        force_poll(conn, username)
+    finally:
+        conn.close()
+    return {"username": username, "status": "due"}
+
+@router.post("/retention/sweep")
+async def retention_sweep():
+    """Run a retention sweep now (normally scheduled every RETENTION_SWEEP_MINUTES)."""
+    return await asyncio.to_thread(run_retention_sweep)
+
+@router.post("/previews/backfill")
+async def backfill_previews():
+    """Queue poster/preview generation for every video lacking cached previews."""
+    queued = await asyncio.to_thread(get_preview_service().backfill)
+    return {"status": "accepted", "queued": queued}
+
+@router.get("/traces")
+def list_traces():
+    """Stored per-run Chrome trace files (newest first) plus sampled Playwright traces."""
+    if not TRACE_DIR.exists():
+        return {"traces": []}
+    files = sorted(TRACE_DIR.iterdir(), key=lambda p: p.stat().st_mtime, reverse=True)
+    return {"traces": [f.name for f in files if f.suffix in (".json", ".zip")]}
+
+@router.get("/traces/api")
+def api_trace():
+    """Rolling trace of recent API requests (requires TRACE_API=1)."""
+    return API_TRACE.to_chrome()
+
+@router.get("/traces/{name}")
+def get_trace(name: str):
+    """Download a run trace; open it in https://ui.perfetto.dev."""
+    path = TRACE_DIR / pathlib.Path(name).name
+    if not path.is_file():
+        raise HTTPException(status_code=404, detail="trace not found")
+    return FileResponse(path, filename=path.name)
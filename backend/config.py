@@ -9,6 +9,23 @@ SCRAPE_INTERVAL: int = int(os.getenv("SCRAPE_INTERVAL", "30"))  # in minutes
 LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO").upper()
 MAX_NEW_VIDEOS_PER_RUN: int = int(os.getenv("MAX_NEW_VIDEOS_PER_RUN", "10"))
 DOWNLOAD_DIR: str = os.getenv("DOWNLOAD_DIR", "/downloads")
+PREVIEW_WORKERS: int = int(os.getenv("PREVIEW_WORKERS", "2"))  # concurrent ffmpeg jobs
+RETENTION_MAX_BYTES: int = int(float(os.getenv("RETENTION_MAX_BYTES", "0")))  # 0 disables eviction
+RETENTION_POLICY: str = os.getenv("RETENTION_POLICY", "lru").lower()  # lru | largest
+RETENTION_SWEEP_MINUTES: int = int(os.getenv("RETENTION_SWEEP_MINUTES", "15"))
+RETENTION_LOG_DAYS: int = int(os.getenv("RETENTION_LOG_DAYS", "30"))  # run logs/traces kept this long
+HTTP_PROBE: bool = os.getenv("HTTP_PROBE", "1").lower() in ("1", "true", "yes")  # browser-less post probe
+PROBE_POOL_SIZE: int = int(os.getenv("PROBE_POOL_SIZE", "8"))
+PROBE_TIMEOUT: float = float(os.getenv("PROBE_TIMEOUT", "15"))  # seconds
+API_CACHE_SIZE: int = int(os.getenv("API_CACHE_SIZE", "256"))  # cached API responses (LRU)
+API_CACHE_TTL: float = float(os.getenv("API_CACHE_TTL", "300"))  # seconds
+POLL_MIN_MINUTES: int = int(os.getenv("POLL_MIN_MINUTES", "10"))  # adaptive polling bounds
+POLL_MAX_MINUTES: int = int(os.getenv("POLL_MAX_MINUTES", "720"))
+POLL_TICK_MINUTES: int = int(os.getenv("POLL_TICK_MINUTES", "1"))  # how often due accounts are checked
+TRACE_API: bool = os.getenv("TRACE_API", "0").lower() in ("1", "true", "yes")
+TRACE_KEEP: int = int(os.getenv("TRACE_KEEP", "200"))  # newest run traces kept in logs/traces
+TRACE_SLOW_POST_MS: int = int(os.getenv("TRACE_SLOW_POST_MS", "0"))  # 0 disables Playwright traces
+TRACE_SAMPLE_RATE: float = float(os.getenv("TRACE_SAMPLE_RATE", "1.0"))  # fraction of slow posts kept
 
 if not TARGET_ACCOUNT:
     raise ValueError("TARGET_ACCOUNT environment variable must be set.")
@@ -1,11 +1,16 @@
+import base64
+import json
 import sqlite3
 from pathlib import Path
-from typing import Dict, List
+from typing import Any, Dict, List, Sequence, Tuple
 from loguru import logger
 
 from backend.config import DOWNLOAD_DIR
+from backend.tracing import traced
 
 DB_PATH = Path(DOWNLOAD_DIR) / "instagram_posts.db"
+# Catalog of ingested media (``ingested_content`` table) lives next to DOWNLOAD_DIR.
+CONTENT_DB_PATH = (DB_PATH.parent / ".." / "content.db").resolve()
 
 CREATE_TABLE_SQL = """
 CREATE TABLE IF NOT EXISTS posts (
@@ -41,9 +46,13 @@ def save_new_posts(conn: sqlite3.Connection, posts: List[Dict]):
 
 # Ensure indexes exist for ingested_content when module imported
 try:
-    conn_idx = sqlite3.connect(Path(DOWNLOAD_DIR).parent / "content.db")
+    conn_idx = sqlite3.connect(CONTENT_DB_PATH)
     conn_idx.execute("CREATE INDEX IF NOT EXISTS idx_ingest_date ON ingested_content(ingest_date);")
     conn_idx.execute("CREATE INDEX IF NOT EXISTS idx_source_type ON ingested_content(source_type);")
+    conn_idx.execute("CREATE INDEX IF NOT EXISTS idx_original_url ON ingested_content(original_url);")
+    conn_idx.execute("CREATE INDEX IF NOT EXISTS idx_file_path ON ingested_content(file_path);")
+    conn_idx.execute("CREATE INDEX IF NOT EXISTS idx_ingest_date_id ON ingested_content(ingest_date, id);")
+    conn_idx.execute("CREATE INDEX IF NOT EXISTS idx_source_type_date_id ON ingested_content(source_type, ingest_date, id);")
     conn_idx.close()
 except Exception:
     pass
@@ -52,29 +61,200 @@ except Exception:
 # Ingested content metadata helpers
 # ---------------------------------------------------------------------------
 
+def catalog_exists(conn: sqlite3.Connection) -> bool:
+    """True once ``ingested_content`` has been created in *conn*'s database."""
+    row = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'ingested_content'"
+    ).fetchone()
+    return row is not None
+
+
+# Columns added to ingested_content after its original schema; applied lazily by
+# ensure_catalog_columns() so existing databases upgrade in place.
+CATALOG_EXTRA_COLUMNS = {
+    "file_size": "INTEGER",
+    "last_accessed": "TEXT",
+    "evicted": "INTEGER NOT NULL DEFAULT 0",
+    "pinned": "INTEGER NOT NULL DEFAULT 0",
+    "preview_key": "TEXT",
+}
+
+
+def ensure_catalog_columns(conn: sqlite3.Connection) -> None:
+    existing = {row[1] for row in conn.execute("PRAGMA table_info(ingested_content)")}
+    for name, decl in CATALOG_EXTRA_COLUMNS.items():
+        if name not in existing:
+            conn.execute(f"ALTER TABLE ingested_content ADD COLUMN {name} {decl}")
+
+
+CATALOG_TABLE_SQL = """
+CREATE TABLE IF NOT EXISTS ingested_content (
+  id TEXT PRIMARY KEY,
+  source_type TEXT NOT NULL,
+  original_url TEXT NOT NULL,
+  file_path TEXT NOT NULL,
+  publish_date TEXT,
+  author TEXT,
+  length_seconds INTEGER,
+  language TEXT,
+  license TEXT,
+  ingest_date TEXT NOT NULL,
+  notes TEXT,
+  UNIQUE(original_url, file_path) ON CONFLICT IGNORE
+);
+CREATE INDEX IF NOT EXISTS idx_ingest_date ON ingested_content(ingest_date);
+CREATE INDEX IF NOT EXISTS idx_source_type ON ingested_content(source_type);
+CREATE INDEX IF NOT EXISTS idx_original_url ON ingested_content(original_url);
+CREATE INDEX IF NOT EXISTS idx_file_path ON ingested_content(file_path);
+-- keyset pagination of the metadata listing, with and without a source filter
+CREATE INDEX IF NOT EXISTS idx_ingest_date_id ON ingested_content(ingest_date, id);
+CREATE INDEX IF NOT EXISTS idx_source_type_date_id ON ingested_content(source_type, ingest_date, id);
+-- persistent generation counter read by response caches (see backend.db.generation)
+CREATE TABLE IF NOT EXISTS catalog_generation (
+  id INTEGER PRIMARY KEY CHECK (id = 1),
+  value INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO catalog_generation (id, value) VALUES (1, 0);
+CREATE TRIGGER IF NOT EXISTS trg_generation_insert AFTER INSERT ON ingested_content
+BEGIN UPDATE catalog_generation SET value = value + 1 WHERE id = 1; END;
+CREATE TRIGGER IF NOT EXISTS trg_generation_update AFTER UPDATE ON ingested_content
+BEGIN UPDATE catalog_generation SET value = value + 1 WHERE id = 1; END;
+CREATE TRIGGER IF NOT EXISTS trg_generation_delete AFTER DELETE ON ingested_content
+BEGIN UPDATE catalog_generation SET value = value + 1 WHERE id = 1; END;
+"""
+
+
+def ensure_catalog_table(conn: sqlite3.Connection) -> None:
+    """Create ``ingested_content`` with its indexes and upgrade it to the current columns."""
+    conn.executescript(CATALOG_TABLE_SQL)
+    ensure_catalog_columns(conn)
+
+
+CATALOG_COLUMNS = (
+    "id", "source_type", "original_url", "file_path", "publish_date", "author", "length_seconds",
+    "language", "license", "ingest_date", "notes", *CATALOG_EXTRA_COLUMNS,
+)
+
+
+def encode_cursor(ingest_date: str, row_id: str) -> str:
+    """Opaque keyset cursor pointing just past the row (ingest_date, id)."""
+    raw = json.dumps([ingest_date, row_id], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[str, str]:
+    """Inverse of :func:`encode_cursor`; raises ValueError on garbage."""
+    try:
+        ingest_date, row_id = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except Exception as exc:
+        raise ValueError(f"invalid cursor: {cursor!r}") from exc
+    return str(ingest_date), str(row_id)
+
+
+@traced("fetch_metadata", cat="sqlite")
+def fetch_metadata_page(limit: int = 50,
+                        offset: int = 0,
+                        source_type: str | None = None,
+                        *,
+                        cursor: str | None = None,
+                        fields: Sequence[str] | None = None,
+                        db_path: str | Path = CONTENT_DB_PATH) -> Dict[str, Any]:
+    """One page of catalog rows ordered by (ingest_date, id) DESC.
+
+    With *cursor* the page starts after that row (keyset pagination, no OFFSET
+    scan) and *offset* is ignored.  *fields* restricts the selected columns to
+    the given subset of :data:`CATALOG_COLUMNS`.  Returns ``{"rows", "next_cursor"}``;
+    ``next_cursor`` is None on the last page.
+    """
+    page: Dict[str, Any] = {"rows": [], "next_cursor": None}
+    after = decode_cursor(cursor) if cursor else None
+    db_path = Path(db_path)
+    if not db_path.exists():
+        return page
+    conn = sqlite3.connect(db_path)
+    conn.row_factory = sqlite3.Row
+    try:
+        if not catalog_exists(conn):
+            return page
+        existing = {row[1] for row in conn.execute("PRAGMA table_info(ingested_content)")}
+        columns = [c for c in CATALOG_COLUMNS if c in existing and (fields is None or c in fields)]
+        # the cursor is built from these two, so they are always read
+        select = list(dict.fromkeys([*columns, "ingest_date", "id"]))
+        where, params = [], []
+        if source_type:
+            where.append("source_type = ?")
+            params.append(source_type)
+        if after:
+            where.append("(ingest_date < ? OR (ingest_date = ? AND id < ?))")
+            params.extend([after[0], after[0], after[1]])
+        query = f"SELECT {', '.join(select)} FROM ingested_content"
+        if where:
+            query += " WHERE " + " AND ".join(where)
+        query += " ORDER BY ingest_date DESC, id DESC LIMIT ?"
+        params.append(limit + 1)
+        if not after and offset:
+            query += " OFFSET ?"
+            params.append(offset)
+        rows = conn.execute(query, params).fetchall()
+        if len(rows) > limit:
+            rows = rows[:limit]
+            page["next_cursor"] = encode_cursor(rows[-1]["ingest_date"], rows[-1]["id"])
+        page["rows"] = [{c: r[c] for c in columns} for r in rows]
+        return page
+    finally:
+        conn.close()
+
+
 def fetch_metadata(limit: int = 50, offset: int = 0, source_type: str | None = None):
     """Retrieve metadata rows for API.
 
     Results are ordered by ingest_date DESC.
     """
-    import sqlite3
+    return fetch_metadata_page(limit, offset, source_type)["rows"]
+
 
-    db_path = DB_PATH.parent / ".." / "content.db"
-    db_path = db_path.resolve()
+@traced("find_ingested_file", cat="sqlite")
+def find_ingested_file(original_url: str, db_path: str | Path = CONTENT_DB_PATH) -> str | None:
+    """Return the stored file_path for *original_url*, or None if not catalogued.
+
+    Answered from ``idx_original_url`` so the download path never has to stat
+    the media directory to decide whether a post was already fetched.
+    """
+    db_path = Path(db_path)
     if not db_path.exists():
-        return []
+        return None
     conn = sqlite3.connect(db_path)
-    conn.row_factory = sqlite3.Row
     try:
-        params = []
-        query = "SELECT * FROM ingested_content"
-        if source_type:
-            query += " WHERE source_type = ?"
-            params.append(source_type)
-        query += " ORDER BY ingest_date DESC LIMIT ? OFFSET ?"
-        params.extend([limit, offset])
-        cur = conn.execute(query, params)
-        rows = [dict(r) for r in cur.fetchall()]
-        return rows
+        if not catalog_exists(conn):
+            return None
+        row = conn.execute(
+            "SELECT file_path FROM ingested_content WHERE original_url = ? LIMIT 1",
+            (original_url,),
+        ).fetchone()
+        return row[0] if row else None
+    finally:
+        conn.close()
+
+
+@traced("find_ingested_urls", cat="sqlite")
+def find_ingested_urls(urls: List[str], db_path: str | Path = CONTENT_DB_PATH) -> Dict[str, str]:
+    """Batch form of :func:`find_ingested_file`: ``{original_url: file_path}`` for known URLs."""
+    db_path = Path(db_path)
+    if not urls or not db_path.exists():
+        return {}
+    conn = sqlite3.connect(db_path)
+    try:
+        if not catalog_exists(conn):
+            return {}
+        found: Dict[str, str] = {}
+        for i in range(0, len(urls), 500):
+            chunk = urls[i:i + 500]
+            placeholders = ",".join("?" * len(chunk))
+            cur = conn.execute(
+                f"SELECT original_url, file_path FROM ingested_content WHERE original_url IN ({placeholders})",
+                chunk,
+            )
+            found.update({row[0]: row[1] for row in cur})
+        return found
     finally:
         conn.close()
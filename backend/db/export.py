@@ -0,0 +1,150 @@
+"""Streaming NDJSON export of the ``ingested_content`` catalog.
+
+Rows are read from a server-side SQLite cursor and encoded one line at a time,
+so exporting the full catalog keeps memory flat regardless of its size.  The
+output can optionally be gzip-compressed on the fly.
+
+CLI usage::
+
+    python -m backend.db.export --since 2025-09-01T00:00:00Z --gzip -o catalog.ndjson.gz
+
+Rows are ordered by ``(ingest_date, id)``.  ``ingest_date`` only has
+one-second resolution, so incremental pulls should resume with both values of
+the last row received (``--since <ingest_date> --after-id <id>``); resuming on
+``ingest_date`` alone can skip rows that share that second.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sqlite3
+import sys
+import zlib
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from loguru import logger
+
+from backend.db.db import CONTENT_DB_PATH, catalog_exists
+
+# Rows pulled from SQLite per fetchmany() call; also the number of NDJSON lines
+# joined into a single output chunk.
+EXPORT_BATCH_SIZE = 1000
+
+
+def iter_catalog_rows(*,
+                      since: str | None = None,
+                      after_id: str | None = None,
+                      source_type: str | None = None,
+                      db_path: str | Path = CONTENT_DB_PATH,
+                      batch_size: int = EXPORT_BATCH_SIZE) -> Iterator[dict]:
+    """Yield catalog rows ordered by (ingest_date, id) ASC.
+
+    ``since`` alone is exclusive on ``ingest_date``.  Together with ``after_id``
+    it is a composite resume token: rows in the same second as ``since`` are
+    returned if their id sorts after ``after_id``.
+    """
+    if after_id and not since:
+        raise ValueError("after_id requires since")
+    db_path = Path(db_path)
+    if not db_path.exists():
+        return
+    # The generator may be resumed from different worker threads when served
+    # through a StreamingResponse, hence check_same_thread=False.
+    conn = sqlite3.connect(db_path, check_same_thread=False)
+    conn.row_factory = sqlite3.Row
+    try:
+        if not catalog_exists(conn):
+            return
+        params: list = []
+        clauses: list[str] = []
+        if since and after_id:
+            clauses.append("(ingest_date > ? OR (ingest_date = ? AND id > ?))")
+            params.extend([since, since, after_id])
+        elif since:
+            clauses.append("ingest_date > ?")
+            params.append(since)
+        if source_type:
+            clauses.append("source_type = ?")
+            params.append(source_type)
+        query = "SELECT * FROM ingested_content"
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        query += " ORDER BY ingest_date ASC, id ASC"
+        cur = conn.execute(query, params)
+        while True:
+            batch = cur.fetchmany(batch_size)
+            if not batch:
+                break
+            for row in batch:
+                yield dict(row)
+    finally:
+        conn.close()
+
+
+def iter_ndjson(rows: Iterable[dict], batch_size: int = EXPORT_BATCH_SIZE) -> Iterator[bytes]:
+    """Encode rows as NDJSON, yielding one bytes chunk per ``batch_size`` lines."""
+    lines: list[str] = []
+    for row in rows:
+        lines.append(json.dumps(row, ensure_ascii=False))
+        if len(lines) >= batch_size:
+            yield ("\n".join(lines) + "\n").encode("utf-8")
+            lines.clear()
+    if lines:
+        yield ("\n".join(lines) + "\n").encode("utf-8")
+
+
+def iter_gzip(chunks: Iterable[bytes], level: int = 6) -> Iterator[bytes]:
+    """Gzip-compress a stream of chunks without buffering the whole payload."""
+    # wbits=31 → zlib emits a gzip header/trailer instead of a raw zlib stream
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def stream_catalog(*,
+                   since: str | None = None,
+                   after_id: str | None = None,
+                   source_type: str | None = None,
+                   gzip: bool = False,
+                   db_path: str | Path = CONTENT_DB_PATH) -> Iterator[bytes]:
+    """Return an iterator of NDJSON (optionally gzip) bytes for the catalog."""
+    if after_id and not since:
+        # raised here, not lazily from the generator, so callers can reject the request up front
+        raise ValueError("after_id requires since")
+    chunks = iter_ndjson(iter_catalog_rows(since=since, after_id=after_id, source_type=source_type, db_path=db_path))
+    return iter_gzip(chunks) if gzip else chunks
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Export ingested_content as NDJSON.")
+    parser.add_argument("--since", help="Only rows with ingest_date greater than this value")
+    parser.add_argument("--after-id", help="With --since: resume after this id within the same ingest_date")
+    parser.add_argument("--source-type", help="Restrict to a single source_type")
+    parser.add_argument("--gzip", action="store_true", help="Gzip-compress the output")
+    parser.add_argument("--db", default=str(CONTENT_DB_PATH), help="Path to content.db")
+    parser.add_argument("-o", "--output", help="Output file (default: stdout)")
+    args = parser.parse_args(argv)
+    if args.after_id and not args.since:
+        parser.error("--after-id requires --since")
+
+    chunks = stream_catalog(since=args.since, after_id=args.after_id, source_type=args.source_type, gzip=args.gzip, db_path=args.db)
+    if args.output:
+        written = 0
+        with open(args.output, "wb") as f:
+            for chunk in chunks:
+                f.write(chunk)
+                written += len(chunk)
+        logger.info("Exported catalog to {} ({} bytes)", args.output, written)
+    else:
+        out = sys.stdout.buffer
+        for chunk in chunks:
+            out.write(chunk)
+        out.flush()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""Catalog generation counter.
+
+Response caches include the current generation in their keys and ETags, so
+cached entries and ETags go stale exactly when new data lands.  The generation
+combines three parts:
+
+* a persistent counter in ``content.db`` (``catalog_generation`` table) that
+  triggers on ``ingested_content`` bump on every insert/update/delete – so
+  writes made by other processes (``reindex``, ``migrate_layout``, …) are seen;
+* an in-process counter bumped by :func:`bump_catalog_generation` for changes
+  that live outside the catalog table (finished preview files…);
+* a per-process nonce, so an ETag issued before a restart never matches after it.
+
+Writers that change derived tables without touching ``ingested_content`` (e.g.
+``stats --rebuild``) pass their connection to :func:`bump_catalog_generation`
+to bump the persistent counter as well.
+"""
+from __future__ import annotations
+
+import sqlite3
+import threading
+import uuid
+from pathlib import Path
+from typing import Optional
+
+from backend.db.db import CONTENT_DB_PATH
+
+_NONCE = uuid.uuid4().hex[:8]
+_lock = threading.Lock()
+_generation = 0
+
+
+def _db_generation(db_path: Path) -> int:
+    if not db_path.exists():
+        return 0
+    try:
+        conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+        try:
+            row = conn.execute("SELECT value FROM catalog_generation WHERE id = 1").fetchone()
+        finally:
+            conn.close()
+    except sqlite3.Error:  # older database without the counter table
+        return 0
+    return row[0] if row else 0
+
+
+def catalog_generation(db_path: str | Path | None = None) -> str:
+    return f"{_NONCE}.{_generation}.{_db_generation(Path(db_path or CONTENT_DB_PATH))}"
+
+
+def bump_catalog_generation(conn: Optional[sqlite3.Connection] = None) -> int:
+    """Bump the in-process counter; with *conn*, also the persistent one in that database."""
+    global _generation
+    if conn is not None:
+        try:
+            with conn:
+                conn.execute("UPDATE catalog_generation SET value = value + 1 WHERE id = 1")
+        except sqlite3.OperationalError:
+            pass
+    with _lock:
+        _generation += 1
+        return _generation
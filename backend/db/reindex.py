@@ -0,0 +1,269 @@
+"""Rebuild the ``ingested_content`` catalog from JSON sidecars.
+
+Every download writes ``<media>.json`` next to the media file, so the sidecars
+are the source of truth if ``content.db`` is lost, corrupted or out of sync.
+The rebuild:
+
+1. walks ``DATA_DIR`` once with ``os.scandir`` (skipping ``previews/``),
+   collecting sidecars and media files with their sizes;
+2. parses sidecars in a process pool, in batches to keep IPC overhead low;
+3. checks each sidecar's media file exists and matches the recorded size
+   (missing media is loaded as ``evicted = 1`` – retention keeps sidecars);
+4. bulk-loads rows with ``executemany`` in large transactions;
+5. reports orphans both ways: sidecars without media, media without sidecars,
+   catalog rows without sidecars, and ``posts`` (instagram_posts.db) vs catalog.
+
+::
+
+    python -m backend.db.reindex                 # merge into the existing catalog
+    python -m backend.db.reindex --fresh         # build a new content.db and swap it in
+    python -m backend.db.reindex --dry-run -v    # only report
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sqlite3
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urlparse
+
+from loguru import logger
+
+from backend.db.db import CONTENT_DB_PATH, DB_PATH, catalog_exists, ensure_catalog_table
+from backend.db.generation import bump_catalog_generation
+
+DATA_DIR = Path(os.getenv("DATA_DIR", "./data"))
+SKIP_DIRS = {"previews"}
+MEDIA_SUFFIXES = (".mp4", ".mov", ".webm", ".mp3", ".m4a", ".wav")
+PARSE_BATCH = 512  # sidecars per worker task
+INSERT_BATCH = 20000  # rows per transaction
+INLINE_THRESHOLD = 2000  # below this many sidecars a process pool costs more than it saves
+REPORT_SAMPLE = 20
+
+INSERT_SQL = """
+INSERT OR IGNORE INTO ingested_content (
+  id, source_type, original_url, file_path, publish_date, author, length_seconds,
+  language, license, ingest_date, notes, file_size, evicted)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+def scan_tree(root: str | Path) -> Tuple[List[str], Dict[str, Tuple[str, int]]]:
+    """Return (sidecar paths, {media path without suffix: (media path, size)})."""
+    sidecars: List[str] = []
+    media: Dict[str, Tuple[str, int]] = {}
+    stack = [str(root)]
+    top = os.path.abspath(root)
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        if not (current == top and entry.name in SKIP_DIRS) and not entry.name.startswith("."):
+                            stack.append(os.path.abspath(entry.path))
+                    elif entry.name.endswith(".json"):
+                        sidecars.append(entry.path)
+                    elif entry.name.lower().endswith(MEDIA_SUFFIXES) and ".tmp" not in entry.name:
+                        stem = os.path.splitext(entry.path)[0]
+                        media[stem] = (entry.path, entry.stat(follow_symlinks=False).st_size)
+        except (FileNotFoundError, NotADirectoryError):
+            continue
+    return sidecars, media
+
+
+def _parse_batch(paths: List[str]) -> List[Tuple[str, Optional[Dict[str, Any]]]]:
+    """Worker: load sidecars; non-metadata JSON (or garbage) yields None."""
+    out = []
+    for path in paths:
+        try:
+            with open(path, "rb") as fh:
+                data = json.loads(fh.read())
+        except (OSError, ValueError):
+            out.append((path, None))
+            continue
+        if isinstance(data, dict) and data.get("source_id") and data.get("original_url"):
+            out.append((path, data))
+        else:
+            out.append((path, None))
+    return out
+
+
+def parse_sidecars(paths: List[str], workers: Optional[int] = None) -> Iterator[Tuple[str, Optional[Dict[str, Any]]]]:
+    batches = [paths[i:i + PARSE_BATCH] for i in range(0, len(paths), PARSE_BATCH)]
+    if len(paths) < INLINE_THRESHOLD or workers == 1:
+        for batch in batches:
+            yield from _parse_batch(batch)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for result in pool.map(_parse_batch, batches):
+            yield from result
+
+
+def _row(md: Dict[str, Any], file_path: str, size: Optional[int], evicted: bool) -> tuple:
+    author = md.get("author") or []
+    return (
+        md["source_id"],
+        md.get("source_type") or "unknown",
+        md["original_url"],
+        file_path,
+        md.get("publish_date"),
+        ",".join(author) if isinstance(author, list) else str(author),
+        md.get("length_seconds"),
+        md.get("language"),
+        md.get("license"),
+        md.get("ingest_date") or "",
+        md.get("notes"),
+        size,
+        1 if evicted else 0,
+    )
+
+
+def _post_code(url: str) -> Optional[str]:
+    parts = [p for p in urlparse(url).path.split("/") if p]
+    for kind, code in zip(parts, parts[1:]):
+        if kind in ("p", "reel", "tv"):
+            return code
+    return None
+
+
+def _posts_orphans(catalog_urls: List[str], posts_db: Path) -> Dict[str, List[str]]:
+    """Compare instagram_posts.db ``posts`` ids with catalogued Instagram shortcodes."""
+    if not posts_db.exists():
+        return {"posts_without_catalog": [], "catalog_without_posts": []}
+    conn = sqlite3.connect(posts_db)
+    try:
+        has_posts = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'posts'"
+        ).fetchone()
+        posts = {
+            row[0] for row in conn.execute("SELECT id FROM posts WHERE media_type = 'video'")
+        } if has_posts else set()
+    finally:
+        conn.close()
+    codes = {c for c in map(_post_code, catalog_urls) if c}
+    return {
+        "posts_without_catalog": sorted(posts - codes),
+        "catalog_without_posts": sorted(codes - posts),
+    }
+
+
+def reindex(data_dir: str | Path = DATA_DIR,
+            db_path: str | Path = CONTENT_DB_PATH,
+            *,
+            posts_db: str | Path = DB_PATH,
+            workers: Optional[int] = None,
+            fresh: bool = False,
+            dry_run: bool = False) -> Dict[str, Any]:
+    """Load every sidecar under *data_dir* into the catalog; returns a report dict."""
+    data_dir, db_path = Path(data_dir), Path(db_path)
+    sidecars, media = scan_tree(data_dir)
+    logger.info("Found {} sidecars and {} media files under {}", len(sidecars), len(media), data_dir)
+
+    report: Dict[str, Any] = {
+        "sidecars": len(sidecars), "media_files": len(media), "inserted": 0,
+        "invalid_sidecars": [], "missing_media": [], "size_mismatch": [],
+        "media_without_sidecar": [], "rows_without_sidecar": [],
+    }
+    rows: List[tuple] = []
+    claimed = set()
+    for path, md in parse_sidecars(sidecars, workers):
+        if md is None:
+            report["invalid_sidecars"].append(path)
+            continue
+        stem = os.path.splitext(path)[0]
+        claimed.add(stem)
+        found = media.get(stem)
+        if found is None:
+            report["missing_media"].append(path)
+            rows.append(_row(md, md.get("file_path") or stem, md.get("file_size"), evicted=True))
+            continue
+        media_path, size = found
+        if md.get("file_size") not in (None, size):
+            report["size_mismatch"].append(media_path)
+        rows.append(_row(md, os.path.abspath(media_path), size, evicted=False))
+    report["media_without_sidecar"] = sorted(p for stem, (p, _) in media.items() if stem not in claimed)
+
+    target = db_path.with_name(db_path.name + ".reindex") if fresh else db_path
+    if dry_run:
+        conn = sqlite3.connect(db_path) if db_path.exists() else sqlite3.connect(":memory:")
+    else:
+        target.parent.mkdir(parents=True, exist_ok=True)
+        if fresh:
+            target.unlink(missing_ok=True)
+        conn = sqlite3.connect(target)
+    try:
+        known_ids = {r[0] for r in rows}
+        if catalog_exists(conn) and not fresh:
+            for row_id, file_path in conn.execute("SELECT id, file_path FROM ingested_content"):
+                if row_id not in known_ids:
+                    report["rows_without_sidecar"].append(file_path)
+        if not dry_run:
+            conn.execute("PRAGMA synchronous = OFF")
+            conn.execute("PRAGMA temp_store = MEMORY")
+            conn.execute("PRAGMA cache_size = -65536")
+            ensure_catalog_table(conn)
+            count = "SELECT COUNT(*) FROM ingested_content"
+            before = conn.execute(count).fetchone()[0]
+            for i in range(0, len(rows), INSERT_BATCH):
+                with conn:
+                    conn.executemany(INSERT_SQL, rows[i:i + INSERT_BATCH])
+            # total_changes would also count trigger writes (rollups, generation)
+            report["inserted"] = conn.execute(count).fetchone()[0] - before
+            # after the bulk load: backfills rollups on a fresh db, no-op otherwise
+            from backend.db.stats import ensure_stats_schema
+            ensure_stats_schema(conn)
+        catalog_urls = [u for (u,) in conn.execute("SELECT original_url FROM ingested_content")] \
+            if catalog_exists(conn) else []
+    finally:
+        conn.close()
+
+    if dry_run:
+        catalog_urls = sorted({r[2] for r in rows} | set(catalog_urls))
+    report.update(_posts_orphans(catalog_urls, Path(posts_db)))
+    if not dry_run:
+        if fresh:
+            if db_path.exists():
+                os.replace(db_path, db_path.with_name(db_path.name + ".bak"))
+            os.replace(target, db_path)
+        bump_catalog_generation()
+    logger.info(
+        "Reindex: {} rows inserted from {} sidecars ({} missing media, {} size mismatches, "
+        "{} media without sidecar, {} rows without sidecar)",
+        report["inserted"], len(sidecars), len(report["missing_media"]), len(report["size_mismatch"]),
+        len(report["media_without_sidecar"]), len(report["rows_without_sidecar"]),
+    )
+    return report
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Rebuild content.db from JSON sidecars.")
+    parser.add_argument("--data-dir", default=str(DATA_DIR), help="Root to scan (default: DATA_DIR)")
+    parser.add_argument("--db", default=str(CONTENT_DB_PATH), help="Path to content.db")
+    parser.add_argument("--posts-db", default=str(DB_PATH), help="Path to instagram_posts.db")
+    parser.add_argument("--workers", type=int, default=None, help="Parser processes (default: CPU count)")
+    parser.add_argument("--fresh", action="store_true",
+                        help="Build a new catalog and swap it in (old file kept as .bak; pins and access times are lost)")
+    parser.add_argument("--dry-run", action="store_true", help="Only report; do not write")
+    parser.add_argument("-v", "--verbose", action="store_true", help="List sample paths per orphan category")
+    args = parser.parse_args(argv)
+
+    report = reindex(args.data_dir, args.db, posts_db=args.posts_db, workers=args.workers,
+                     fresh=args.fresh, dry_run=args.dry_run)
+    summary = {k: (len(v) if isinstance(v, list) else v) for k, v in report.items()}
+    print(json.dumps(summary, indent=2))
+    if args.verbose:
+        for key, value in report.items():
+            if isinstance(value, list) and value:
+                print(f"\n{key}:")
+                for item in value[:REPORT_SAMPLE]:
+                    print(f"  {item}")
+                if len(value) > REPORT_SAMPLE:
+                    print(f"  ... {len(value) - REPORT_SAMPLE} more")
+
+
+if __name__ == "__main__":
+    main()
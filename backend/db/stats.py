@@ -0,0 +1,217 @@
+"""Incrementally maintained catalog statistics.
+
+Two rollup tables are kept up to date by SQLite triggers on
+``ingested_content`` so that dashboard queries never scan the catalog:
+
+* ``catalog_rollup_daily``  – items / seconds per (ingest day, source_type, author)
+* ``catalog_rollup_totals`` – items / seconds per (source_type, author)
+
+Both are bounded by the number of accounts (and days), not by the number of
+ingested rows.  ``rebuild_stats`` recomputes them from scratch for backfills::
+
+    python -m backend.db.stats --rebuild
+"""
+from __future__ import annotations
+
+import argparse
+import sqlite3
+from pathlib import Path
+from typing import Any, Dict
+
+from loguru import logger
+
+from backend.db.db import CONTENT_DB_PATH, ensure_catalog_table
+from backend.db.generation import bump_catalog_generation
+
+ROLLUP_SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS catalog_rollup_daily (
+  day TEXT NOT NULL,
+  source_type TEXT NOT NULL,
+  author TEXT NOT NULL,
+  items INTEGER NOT NULL DEFAULT 0,
+  total_seconds INTEGER NOT NULL DEFAULT 0,
+  PRIMARY KEY (day, source_type, author)
+);
+CREATE TABLE IF NOT EXISTS catalog_rollup_totals (
+  source_type TEXT NOT NULL,
+  author TEXT NOT NULL,
+  items INTEGER NOT NULL DEFAULT 0,
+  total_seconds INTEGER NOT NULL DEFAULT 0,
+  PRIMARY KEY (source_type, author)
+);
+
+CREATE TRIGGER IF NOT EXISTS trg_rollup_insert AFTER INSERT ON ingested_content
+BEGIN
+  INSERT INTO catalog_rollup_daily (day, source_type, author, items, total_seconds)
+  VALUES (substr(NEW.ingest_date, 1, 10), NEW.source_type, COALESCE(NEW.author, ''), 1,
+          COALESCE(NEW.length_seconds, 0))
+  ON CONFLICT (day, source_type, author) DO UPDATE SET
+    items = items + 1, total_seconds = total_seconds + excluded.total_seconds;
+  INSERT INTO catalog_rollup_totals (source_type, author, items, total_seconds)
+  VALUES (NEW.source_type, COALESCE(NEW.author, ''), 1, COALESCE(NEW.length_seconds, 0))
+  ON CONFLICT (source_type, author) DO UPDATE SET
+    items = items + 1, total_seconds = total_seconds + excluded.total_seconds;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_rollup_delete AFTER DELETE ON ingested_content
+BEGIN
+  UPDATE catalog_rollup_daily
+     SET items = items - 1, total_seconds = total_seconds - COALESCE(OLD.length_seconds, 0)
+   WHERE day = substr(OLD.ingest_date, 1, 10) AND source_type = OLD.source_type
+     AND author = COALESCE(OLD.author, '');
+  UPDATE catalog_rollup_totals
+     SET items = items - 1, total_seconds = total_seconds - COALESCE(OLD.length_seconds, 0)
+   WHERE source_type = OLD.source_type AND author = COALESCE(OLD.author, '');
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_rollup_update
+AFTER UPDATE OF source_type, author, length_seconds, ingest_date ON ingested_content
+BEGIN
+  UPDATE catalog_rollup_daily
+     SET items = items - 1, total_seconds = total_seconds - COALESCE(OLD.length_seconds, 0)
+   WHERE day = substr(OLD.ingest_date, 1, 10) AND source_type = OLD.source_type
+     AND author = COALESCE(OLD.author, '');
+  UPDATE catalog_rollup_totals
+     SET items = items - 1, total_seconds = total_seconds - COALESCE(OLD.length_seconds, 0)
+   WHERE source_type = OLD.source_type AND author = COALESCE(OLD.author, '');
+  INSERT INTO catalog_rollup_daily (day, source_type, author, items, total_seconds)
+  VALUES (substr(NEW.ingest_date, 1, 10), NEW.source_type, COALESCE(NEW.author, ''), 1,
+          COALESCE(NEW.length_seconds, 0))
+  ON CONFLICT (day, source_type, author) DO UPDATE SET
+    items = items + 1, total_seconds = total_seconds + excluded.total_seconds;
+  INSERT INTO catalog_rollup_totals (source_type, author, items, total_seconds)
+  VALUES (NEW.source_type, COALESCE(NEW.author, ''), 1, COALESCE(NEW.length_seconds, 0))
+  ON CONFLICT (source_type, author) DO UPDATE SET
+    items = items + 1, total_seconds = total_seconds + excluded.total_seconds;
+END;
+"""
+
+
+def ensure_stats_schema(conn: sqlite3.Connection) -> bool:
+    """Create rollup tables + triggers; backfill them the first time they appear.
+
+    Must be called after ``ingested_content`` exists.  Returns True if the
+    rollups were just created (and therefore already backfilled).
+    """
+    existed = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'catalog_rollup_totals'"
+    ).fetchone()
+    conn.executescript(ROLLUP_SCHEMA_SQL)
+    if not existed:
+        rebuild_stats(conn)
+    return not existed
+
+
+def rebuild_stats(conn: sqlite3.Connection) -> None:
+    """Recompute both rollup tables from ``ingested_content`` in one transaction."""
+    with conn:
+        conn.execute("DELETE FROM catalog_rollup_daily")
+        conn.execute("DELETE FROM catalog_rollup_totals")
+        conn.execute(
+            """
+            INSERT INTO catalog_rollup_daily (day, source_type, author, items, total_seconds)
+            SELECT substr(ingest_date, 1, 10), source_type, COALESCE(author, ''), COUNT(*),
+                   COALESCE(SUM(length_seconds), 0)
+              FROM ingested_content
+             GROUP BY 1, 2, 3
+            """
+        )
+        conn.execute(
+            """
+            INSERT INTO catalog_rollup_totals (source_type, author, items, total_seconds)
+            SELECT source_type, author, SUM(items), SUM(total_seconds)
+              FROM catalog_rollup_daily
+             GROUP BY source_type, author
+            """
+        )
+    bump_catalog_generation(conn)
+    logger.info("Catalog rollups rebuilt")
+
+
+def fetch_stats(*,
+                since_day: str | None = None,
+                author: str | None = None,
+                db_path: str | Path = CONTENT_DB_PATH) -> Dict[str, Any]:
+    """Read dashboard statistics from the rollup tables only."""
+    empty: Dict[str, Any] = {
+        "totals": {"items": 0, "total_seconds": 0, "total_hours": 0.0},
+        "by_source_type": [],
+        "by_author": [],
+        "daily": [],
+    }
+    db_path = Path(db_path)
+    if not db_path.exists():
+        return empty
+    conn = sqlite3.connect(db_path)
+    conn.row_factory = sqlite3.Row
+    try:
+        has_rollups = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'catalog_rollup_totals'"
+        ).fetchone()
+        if not has_rollups:
+            return empty
+
+        by_source_type = [
+            dict(r)
+            for r in conn.execute(
+                """
+                SELECT source_type, SUM(items) AS items, SUM(total_seconds) AS total_seconds
+                  FROM catalog_rollup_totals
+                 GROUP BY source_type HAVING SUM(items) > 0
+                 ORDER BY items DESC
+                """
+            )
+        ]
+        by_author = [
+            dict(r)
+            for r in conn.execute(
+                """
+                SELECT author, SUM(items) AS items, SUM(total_seconds) AS total_seconds
+                  FROM catalog_rollup_totals
+                 GROUP BY author HAVING SUM(items) > 0
+                 ORDER BY items DESC
+                """
+            )
+        ]
+
+        params: list = []
+        query = "SELECT day, source_type, author, items, total_seconds FROM catalog_rollup_daily WHERE items > 0"
+        if since_day:
+            query += " AND day >= ?"
+            params.append(since_day)
+        if author:
+            query += " AND author = ?"
+            params.append(author)
+        query += " ORDER BY day DESC, author"
+        daily = [dict(r) for r in conn.execute(query, params)]
+
+        items = sum(r["items"] for r in by_source_type)
+        seconds = sum(r["total_seconds"] for r in by_source_type)
+        return {
+            "totals": {"items": items, "total_seconds": seconds, "total_hours": round(seconds / 3600, 2)},
+            "by_source_type": by_source_type,
+            "by_author": by_author,
+            "daily": daily,
+        }
+    finally:
+        conn.close()
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Maintain catalog rollup statistics.")
+    parser.add_argument("--rebuild", action="store_true", help="Recompute rollups from ingested_content")
+    parser.add_argument("--db", default=str(CONTENT_DB_PATH), help="Path to content.db")
+    args = parser.parse_args(argv)
+
+    conn = sqlite3.connect(args.db)
+    try:
+        ensure_catalog_table(conn)
+        created = ensure_stats_schema(conn)
+        if args.rebuild and not created:
+            rebuild_stats(conn)
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
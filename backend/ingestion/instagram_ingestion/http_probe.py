@@ -0,0 +1,142 @@
+"""Browser-less metadata probe for Instagram post pages.
+
+The scraper only needs ``og:video``, ``og:video:upload_date`` and the
+``<video src>`` of a post.  Those are present in the server-rendered HTML, so a
+single GET over a pooled keep-alive session plus a streaming ``HTMLParser``
+(which stops reading as soon as it has what it needs) is enough for most posts.
+:func:`probe_post` returns ``None`` whenever it cannot decide, and callers then
+fall back to rendering the page in Chromium.
+
+A page is only classified as an image post when it is positively identified as
+*this* post (``og:url`` carries the shortcode, ``og:type`` is a post type) and
+advertises a single image.  Login, consent and generic "website" pages, and
+carousels whose videos are not in ``og:video``, go to the browser instead.
+"""
+from __future__ import annotations
+
+import codecs
+import threading
+from dataclasses import dataclass
+from html.parser import HTMLParser
+from typing import Optional
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from loguru import logger
+
+from backend.config import PROBE_POOL_SIZE, PROBE_TIMEOUT
+from backend.tracing import span
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120 Safari/537.36"
+CHUNK_SIZE = 16 * 1024
+# Stop reading after this many bytes even if the parser is not done.
+MAX_PROBE_BYTES = 512 * 1024
+# og:type values Instagram uses for a single post page
+POST_OG_TYPES = ("article", "instapp:photo", "photo")
+
+
+@dataclass
+class ProbeResult:
+    media_type: str
+    video_src: Optional[str] = None
+    upload_ts: Optional[int] = None
+
+
+class _PostMetaParser(HTMLParser):
+    """Collects og:* meta tags and the first <video src>; flags when it can stop."""
+
+    def __init__(self, shortcode: Optional[str] = None):
+        super().__init__(convert_charrefs=True)
+        self.shortcode = shortcode
+        self.meta: dict[str, str] = {}
+        self.image_count = 0
+        self.video_src: Optional[str] = None
+        self.head_done = False
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "meta":
+            a = dict(attrs)
+            prop = a.get("property") or a.get("name")
+            if prop and prop.startswith("og:") and a.get("content") is not None:
+                self.meta.setdefault(prop, a["content"])
+                if prop == "og:image":
+                    self.image_count += 1
+        elif tag == "video" and self.video_src is None:
+            self.video_src = dict(attrs).get("src") or None
+
+    def handle_endtag(self, tag):
+        if tag == "head":
+            self.head_done = True
+
+    @property
+    def done(self) -> bool:
+        # <video> lives in <body>; og tags in <head>.  Once the head is parsed
+        # we only keep reading if a video is advertised but has no URL yet.
+        if self.video_src and "og:video:upload_date" in self.meta:
+            return True
+        if self.head_done and ("og:video" in self.meta or "og:video:secure_url" in self.meta):
+            return True
+        return self.head_done and not self.meta.get("og:type", "").startswith("video")
+
+    def result(self) -> Optional[ProbeResult]:
+        video_src = self.video_src or self.meta.get("og:video") or self.meta.get("og:video:secure_url")
+        og_type = self.meta.get("og:type", "")
+        if video_src:
+            upload_ts = None
+            try:
+                upload_ts = int(self.meta["og:video:upload_date"])
+            except (KeyError, TypeError, ValueError):
+                pass
+            return ProbeResult("video", video_src, upload_ts)
+        if og_type in POST_OG_TYPES and self.image_count == 1 and self._is_this_post():
+            return ProbeResult("image")
+        # Login wall, consent/website page, carousel or a video without URL → undecided
+        return None
+
+    def _is_this_post(self) -> bool:
+        og_url = self.meta.get("og:url", "")
+        return bool(self.shortcode) and f"/{self.shortcode}/" in urlparse(og_url).path + "/"
+
+
+_local = threading.local()
+
+
+def _session() -> requests.Session:
+    """Per-thread pooled keep-alive session."""
+    session = getattr(_local, "session", None)
+    if session is None:
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=PROBE_POOL_SIZE, pool_maxsize=PROBE_POOL_SIZE)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        session.headers.update({"User-Agent": USER_AGENT, "Accept-Language": "en-US"})
+        _local.session = session
+    return session
+
+
+def probe_post(url: str, timeout: float = PROBE_TIMEOUT) -> Optional[ProbeResult]:
+    """Classify a post from its HTML alone; ``None`` means "use the browser"."""
+    parts = [p for p in urlparse(url).path.split("/") if p]
+    parser = _PostMetaParser(shortcode=parts[-1] if parts else None)
+    read = 0
+    with span("http_probe", cat="http", url=url) as sp:
+        try:
+            with _session().get(url, stream=True, timeout=timeout) as r:
+                if r.status_code != 200:
+                    logger.debug("Probe of {} returned HTTP {}", url, r.status_code)
+                    sp["status"] = r.status_code
+                    return None
+                decoder = codecs.getincrementaldecoder(r.encoding or "utf-8")(errors="replace")
+                for chunk in r.iter_content(CHUNK_SIZE):
+                    read += len(chunk)
+                    parser.feed(decoder.decode(chunk))
+                    if parser.done or read >= MAX_PROBE_BYTES:
+                        break
+            result = parser.result()
+        except Exception as e:  # network, unknown charset, malformed markup: the browser copes
+            logger.debug("Probe of {} failed: {!r}", url, e)
+            return None
+        sp["bytes"] = read
+        sp["result"] = result.media_type if result else "fallback"
+    return result
@@ -1,7 +1,8 @@
-from typing import List, Dict
+from typing import List, Dict, Optional, Tuple
 import os
 import requests
 import time
+import random
 from pathlib import Path
 
 # ---------------------------------------------------------------------------
@@ -24,11 +25,161 @@ Path(INSTAGRAM_DIR).mkdir(parents=True, exist_ok=True)
 DOWNLOAD_DIR = INSTAGRAM_DIR
 from loguru import logger
 from backend.ingestion.metadata.metadata_utils import build_metadata, write_sidecar, insert_metadata_to_db
+from backend.media.previews import schedule_previews
+from backend.ingestion.instagram_ingestion.layout import media_path_for
+from backend.db.db import find_ingested_urls
+from backend.config import TRACE_SLOW_POST_MS, TRACE_SAMPLE_RATE, HTTP_PROBE
+from backend.ingestion.instagram_ingestion.http_probe import probe_post
+from backend.tracing import span, traced, TRACE_DIR
 from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeoutError
  
 INSTAGRAM_BASE = "https://www.instagram.com"
+POST_KINDS = ("p", "reel", "tv")
  
  
+def _stop_post_trace(context, username: str, post_id: str, elapsed_ms: float) -> None:
+    """Keep the Playwright trace chunk for slow posts (sampled), discard the rest."""
+    try:
+        if elapsed_ms >= TRACE_SLOW_POST_MS and random.random() < TRACE_SAMPLE_RATE:
+            TRACE_DIR.mkdir(parents=True, exist_ok=True)
+            trace_path = TRACE_DIR / f"{username}_{post_id}_{int(time.time())}.zip"
+            context.tracing.stop_chunk(path=str(trace_path))
+            logger.info("Post {} took {:.0f} ms; Playwright trace saved to {}", post_id, elapsed_ms, trace_path)
+        else:
+            context.tracing.stop_chunk()
+    except Exception:
+        logger.exception("Failed to stop Playwright trace chunk for {}", post_id)
+
+
+def post_id_from_href(href: str) -> Optional[str]:
+    """Extract the shortcode from ``/p/<shortcode>/``-style post links."""
+    try:
+        parts = [part for part in href.split("/") if part]
+        # take the last meaningful segment (shortcode)
+        return parts[-1] if parts[-1] not in ("reel", "p", "tv") else parts[-2]
+    except Exception:
+        return None
+
+
+def canonical_post_url(post_id: str) -> str:
+    """The single ``original_url`` a post is catalogued under, whatever link led to it."""
+    return f"{INSTAGRAM_BASE}/p/{post_id}/"
+
+
+def post_urls(post_id: str) -> List[str]:
+    """Every URL flavour a post may already be catalogued under."""
+    return [f"{INSTAGRAM_BASE}/{kind}/{post_id}/" for kind in POST_KINDS]
+
+
+def format_upload_ts(upload_ts: Optional[int]) -> str:
+    """``og:video:upload_date`` epoch → ``%Y%m%dT%H%M%S`` (empty if unknown)."""
+    if not upload_ts:
+        return ""
+    from datetime import datetime
+    return datetime.utcfromtimestamp(upload_ts).strftime("%Y%m%dT%H%M%S")
+
+
+def probe_duration(dest_path: Path) -> Optional[int]:
+    """Return the video duration in whole seconds via ffprobe, or None."""
+    import subprocess, json as _json
+    try:
+        logger.info("Running ffprobe for {}", dest_path.name)
+        probe_cmd = [
+            "ffprobe",
+            "-v",
+            "error",
+            "-select_streams",
+            "v:0",
+            "-show_entries",
+            "format=duration",
+            "-of",
+            "json",
+            str(dest_path),
+        ]
+        with span("ffprobe", cat="subprocess", file=dest_path.name):
+            proc = subprocess.run(
+                probe_cmd,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                timeout=30,
+                text=True,
+            )
+        if proc.returncode == 0:
+            return int(float(_json.loads(proc.stdout)["format"]["duration"]))
+        logger.warning("ffprobe non-zero exit for {}: {}", dest_path, proc.stdout.strip())
+    except subprocess.TimeoutExpired:
+        logger.warning("ffprobe timed out for {}", dest_path)
+    except Exception:
+        logger.exception("ffprobe failed for {}", dest_path)
+    return None
+
+
+def download_post_video(username: Optional[str], post_id: str, url: str, video_src: str, date_str: str = "",
+                        *, skip_ffprobe: bool = False) -> Tuple[str, Optional[Path]]:
+    """Download one post's video and record its sidecar + catalog row.
+
+    Returns ``(status, path)`` where status is ``"downloaded"``, ``"exists"``
+    (already catalogued; path is the stored file) or ``"failed"``.
+    """
+    try:
+        # Existence is answered from the catalog index, not the filesystem. Keyed by
+        # shortcode: /p/X/, /reel/X/ and /<user>/reel/X/ are all the same post.
+        candidates = [canonical_post_url(post_id), *post_urls(post_id), url]
+        known = find_ingested_urls(candidates)
+        existing = next((known[u] for u in candidates if u in known), None)
+        if existing is not None:
+            logger.debug("Video for {} already ingested at {}", post_id, existing)
+            return "exists", Path(existing)
+
+        ts_suffix = date_str or str(int(time.time()))
+        dest_path = media_path_for(username, post_id, ts_suffix, root=DOWNLOAD_DIR)
+        dest_path.parent.mkdir(parents=True, exist_ok=True)
+        logger.debug("Downloading video {}", video_src)
+        with span("download", cat="io", post_id=post_id) as sp:
+            r = requests.get(video_src, timeout=120)
+            with open(dest_path, "wb") as f:
+                f.write(r.content)
+            sp["bytes"] = len(r.content)
+
+        # Optional ffprobe enrichment
+        duration_sec = None
+        if not skip_ffprobe:
+            duration_sec = probe_duration(dest_path)
+        else:
+            logger.debug("skip_ffprobe=True → duration not extracted")
+
+        # Simple language heuristic (placeholder)
+        lang_code = "und"
+
+        # ------------------------------------------------------------------
+        # Metadata sidecar
+        # ------------------------------------------------------------------
+        try:
+            metadata = build_metadata(
+                source_type="instagram",
+                original_url=canonical_post_url(post_id),
+                file_path=str(dest_path.resolve()),
+                author=username,
+                publish_date=None if not date_str else date_str + "Z",
+                length_seconds=duration_sec,
+                language=lang_code,
+                license_=None,
+                notes="scraped via Headless_browser module",
+                file_size=dest_path.stat().st_size,
+            )
+            write_sidecar(metadata)
+            insert_metadata_to_db(metadata)
+            logger.info("Metadata sidecar + DB log complete for {}", post_id)
+            schedule_previews(dest_path)
+        except Exception:
+            logger.exception("Failed to write metadata for {}", dest_path)
+        return "downloaded", dest_path
+    except Exception as e:
+        logger.exception("Failed to download video {}: {}", url, e)
+        return "failed", None
+
+
+@traced("scrape_account", cat="scrape")
 def scrape_account(username: str, download: bool = False, max_downloads: int = 1000, *, skip_ffprobe: bool = False) -> List[Dict]:
     """Scrape the Instagram feed of a public account for posts.
 
@@ -42,13 +193,18 @@ def scrape_account(username: str, download: bool = False, max_downloads: int = 1
             user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120 Safari/537.36",
             locale="en-US",
         )
+        # Optional Playwright trace capture; chunks are only kept for slow posts
+        pw_tracing = TRACE_SLOW_POST_MS > 0
+        if pw_tracing:
+            context.tracing.start(screenshots=True, snapshots=True)
         page = context.new_page()
         target_url = f"{INSTAGRAM_BASE}/{username}/"
         logger.debug("Navigating to {}", target_url)
         try:
-            page.goto(target_url, timeout=60000)
-            # Wait for posts grid
-            page.wait_for_selector("article", timeout=60000)
+            with span("navigate_profile", cat="browser", url=target_url):
+                page.goto(target_url, timeout=60000)
+                # Wait for posts grid
+                page.wait_for_selector("article", timeout=60000)
 
             # Collect anchors to posts
             anchors = page.query_selector_all("article a")
@@ -62,46 +218,51 @@ def scrape_account(username: str, download: bool = False, max_downloads: int = 1
                     url = href
 
                 # Extract post id from url: /p/<shortcode>/
-                try:
-                    parts = [part for part in href.split("/") if part]
-                    # take the last meaningful segment (shortcode)
-                    post_id = parts[-1] if parts[-1] not in ("reel", "p", "tv") else parts[-2]
-                except Exception:
+                post_id = post_id_from_href(href)
+                if not post_id:
                     continue
 
                 # Open post to detect media type reliably
                 media_type = "image"
                 video_src = None
-                try:
-                    post_page = context.new_page()
-                    post_page.goto(url, timeout=60000)
-                    has_video = post_page.query_selector("video") is not None
-                    if has_video:
-                        media_type = "video"
-                        video_el = post_page.query_selector("video")
-                        video_src = video_el.get_attribute("src") if video_el else None
-                        if not video_src:
-                            meta = post_page.query_selector("meta[property='og:video']")
-                            if meta:
-                                video_src = meta.get_attribute("content")
-                        # get upload timestamp
-                        upload_ts = None
-                        ts_meta = post_page.query_selector("meta[property='og:video:upload_date']")
-                        if ts_meta:
-                            try:
-                                upload_ts = int(ts_meta.get_attribute("content"))
-                            except (TypeError, ValueError):
-                                pass
-                    logger.debug("Post {} classified as {}", post_id, media_type)
-                    post_page.close()
-                except Exception as e:
-                    logger.exception("Failed to inspect post {}: {}", url, e)
-
-                # Date posted placeholder (could be extracted later)
-                date_str = ""
-                if media_type == "video" and upload_ts:
-                    from datetime import datetime
-                    date_str = datetime.utcfromtimestamp(upload_ts).strftime("%Y%m%dT%H%M%S")
+                upload_ts = None
+                probe = probe_post(url) if HTTP_PROBE else None
+                if probe is not None:
+                    media_type, video_src, upload_ts = probe.media_type, probe.video_src, probe.upload_ts
+                    logger.debug("Post {} classified as {} (http probe)", post_id, media_type)
+                else:
+                    if pw_tracing:
+                        context.tracing.start_chunk(title=post_id)
+                    inspect_started = time.perf_counter()
+                    with span("inspect_post", cat="browser", post_id=post_id) as sp:
+                        try:
+                            post_page = context.new_page()
+                            post_page.goto(url, timeout=60000)
+                            has_video = post_page.query_selector("video") is not None
+                            if has_video:
+                                media_type = "video"
+                                video_el = post_page.query_selector("video")
+                                video_src = video_el.get_attribute("src") if video_el else None
+                                if not video_src:
+                                    meta = post_page.query_selector("meta[property='og:video']")
+                                    if meta:
+                                        video_src = meta.get_attribute("content")
+                                # get upload timestamp
+                                ts_meta = post_page.query_selector("meta[property='og:video:upload_date']")
+                                if ts_meta:
+                                    try:
+                                        upload_ts = int(ts_meta.get_attribute("content"))
+                                    except (TypeError, ValueError):
+                                        pass
+                            logger.debug("Post {} classified as {}", post_id, media_type)
+                            post_page.close()
+                        except Exception as e:
+                            logger.exception("Failed to inspect post {}: {}", url, e)
+                        sp["media_type"] = media_type
+                    if pw_tracing:
+                        _stop_post_trace(context, username, post_id, (time.perf_counter() - inspect_started) * 1000)
+
+                date_str = format_upload_ts(upload_ts) if media_type == "video" else ""
                 post_meta = {
                     "id": post_id,
                     "url": url,
@@ -110,84 +271,12 @@ def scrape_account(username: str, download: bool = False, max_downloads: int = 1
                 }
 
                 if download and media_type == "video" and video_src and downloads_done < max_downloads:
-                    try:
-                        Path(DOWNLOAD_DIR).mkdir(parents=True, exist_ok=True)
-                        ts_suffix = post_meta["date_posted"] or str(int(time.time()))
-                        dest_path = Path(DOWNLOAD_DIR) / f"{post_id}_{ts_suffix}.mp4"
-                        if not dest_path.exists():
-                            logger.debug("Downloading video {}", video_src)
-                            r = requests.get(video_src, timeout=120)
-                            with open(dest_path, "wb") as f:
-                                f.write(r.content)
-                            downloads_done += 1
-                            logger.info("Downloaded video to {} ({} / {})", dest_path, downloads_done, max_downloads)
-
-                            # Optional ffprobe enrichment
-                            duration_sec = None
-                            if not skip_ffprobe:
-                                try:
-                                    logger.info("Running ffprobe for {}", dest_path.name)
-                                    import subprocess, json as _json, shlex
-                                    probe_cmd = [
-                                        "ffprobe",
-                                        "-v",
-                                        "error",
-                                        "-select_streams",
-                                        "v:0",
-                                        "-show_entries",
-                                        "format=duration",
-                                        "-of",
-                                        "json",
-                                        str(dest_path),
-                                    ]
-                                    proc = subprocess.run(
-                                        probe_cmd,
-                                        stdout=subprocess.PIPE,
-                                        stderr=subprocess.STDOUT,
-                                        timeout=30,
-                                        text=True,
-                                    )
-                                    if proc.returncode == 0:
-                                        duration_sec = int(float(_json.loads(proc.stdout)["format"]["duration"]))
-                                    else:
-                                        logger.warning("ffprobe non-zero exit for {}: {}", dest_path, proc.stdout.strip())
-                                except subprocess.TimeoutExpired:
-                                    logger.warning("ffprobe timed out for {}", dest_path)
-                                except Exception:
-                                    logger.exception("ffprobe failed for {}", dest_path)
-                            else:
-                                logger.debug("skip_ffprobe=True → duration not extracted")
-
-                            # Simple language heuristic (placeholder)
-                            lang_code = "und"
-
-                            # ------------------------------------------------------------------
-                            # Metadata sidecar
-                            # ------------------------------------------------------------------
-
-                            # ------------------------------------------------------------------
-                            # Metadata sidecar
-                            # ------------------------------------------------------------------
-                            try:
-                                metadata = build_metadata(
-                                    original_url=url,
-                                    file_path=str(dest_path.resolve()),
-                                    author=username,
-                                    publish_date=None if not date_str else date_str + "Z",
-                                    length_seconds=duration_sec,
-                                    language=lang_code,
-                                    license_=None,
-                                    notes="scraped via Headless_browser module",
-                                )
-                                sidecar = write_sidecar(metadata)
-                                insert_metadata_to_db(metadata)
-                                logger.info("Metadata sidecar + DB log complete for {}", post_id)
-                            except Exception:
-                                logger.exception("Failed to write metadata for {}", dest_path)
-                        else:
-                            logger.debug("Video {} already exists on disk", dest_path)
-                    except Exception as e:
-                        logger.exception("Failed to download video {}: {}", url, e)
+                    status, dest_path = download_post_video(
+                        username, post_id, url, video_src, date_str, skip_ffprobe=skip_ffprobe
+                    )
+                    if status == "downloaded":
+                        downloads_done += 1
+                        logger.info("Downloaded video to {} ({} / {})", dest_path, downloads_done, max_downloads)
 
                 posts.append(post_meta)
         except PlaywrightTimeoutError:
@@ -195,6 +284,11 @@ def scrape_account(username: str, download: bool = False, max_downloads: int = 1
         except Exception as e:
             logger.exception("Error scraping Instagram: {}", e)
         finally:
+            if pw_tracing:
+                try:
+                    context.tracing.stop()
+                except Exception:
+                    logger.debug("Playwright tracing already stopped")
             context.close()
             browser.close()
 
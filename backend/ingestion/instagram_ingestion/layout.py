@@ -0,0 +1,61 @@
+"""On-disk layout for Instagram media.
+
+Files are sharded by account and by posting month instead of living in one flat
+directory::
+
+    DATA_DIR/instagram/<account>/<YYYY>/<MM>/<post_id>_<ts>.mp4
+                                             <post_id>_<ts>.json
+
+``ts`` is either ``%Y%m%dT%H%M%S`` (upload date known) or a Unix timestamp
+(download time), matching the historic flat file names.
+"""
+from __future__ import annotations
+
+import os
+import re
+from datetime import datetime
+from pathlib import Path
+
+BASE_DATA_DIR = os.getenv("DATA_DIR", "./data")
+INSTAGRAM_DIR = Path(BASE_DATA_DIR) / "instagram"
+
+UNKNOWN_ACCOUNT = "_unknown"
+_UNSAFE = re.compile(r"[^A-Za-z0-9._-]+")
+_TS = re.compile(r"^(\d{8}T\d{6}|\d+)$")
+
+
+def _account_dir(username: str | None) -> str:
+    name = _UNSAFE.sub("_", (username or "").strip().lstrip("@")).strip("._")
+    return name or UNKNOWN_ACCOUNT
+
+
+def _date_shard(ts_suffix: str) -> tuple[str, str]:
+    """Return (YYYY, MM) for either timestamp flavour used in file names."""
+    try:
+        if len(ts_suffix) >= 8 and "T" in ts_suffix:
+            dt = datetime.strptime(ts_suffix[:8], "%Y%m%d")
+        else:
+            dt = datetime.utcfromtimestamp(int(ts_suffix))
+    except (TypeError, ValueError, OverflowError, OSError):
+        dt = datetime.utcnow()
+    return f"{dt.year:04d}", f"{dt.month:02d}"
+
+
+def media_dir_for(username: str | None, ts_suffix: str, root: str | Path = INSTAGRAM_DIR) -> Path:
+    year, month = _date_shard(ts_suffix)
+    return Path(root) / _account_dir(username) / year / month
+
+
+def media_path_for(username: str | None, post_id: str, ts_suffix: str,
+                   suffix: str = ".mp4", root: str | Path = INSTAGRAM_DIR) -> Path:
+    """Sharded destination path for a post's media file."""
+    return media_dir_for(username, ts_suffix, root) / f"{post_id}_{ts_suffix}{suffix}"
+
+
+def split_media_name(name: str) -> tuple[str, str] | None:
+    """Split ``<post_id>_<ts>.<ext>`` into (post_id, ts); None if it doesn't match."""
+    stem = Path(name).stem
+    post_id, sep, ts = stem.rpartition("_")
+    if not sep or not post_id or not _TS.match(ts):
+        return None
+    return post_id, ts
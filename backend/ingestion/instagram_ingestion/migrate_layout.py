@@ -0,0 +1,177 @@
+"""Move flat ``DATA_DIR/instagram/*`` files into the sharded layout.
+
+Every ``<post_id>_<ts>.*`` file at the top level of the Instagram directory
+(video, JSON sidecar and any derived files sharing the stem) is moved to
+``<account>/<YYYY>/<MM>/`` as defined in :mod:`layout`.  Sidecars get their
+``file_path`` rewritten and ``ingested_content.file_path`` is committed right
+after each post's files are moved, so an interrupted run leaves at most one
+post out of step.  Every run first restores catalog paths that still point into
+the flat directory at files already moved into the sharded tree, so re-running
+after a crash repairs it.
+
+Usage::
+
+    python -m backend.ingestion.instagram_ingestion.migrate_layout [--dry-run]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sqlite3
+from collections import defaultdict
+from itertools import groupby
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from loguru import logger
+
+from backend.db.db import CONTENT_DB_PATH, catalog_exists
+from backend.db.generation import bump_catalog_generation
+from backend.ingestion.instagram_ingestion.layout import INSTAGRAM_DIR, media_dir_for, split_media_name
+
+MEDIA_SUFFIXES = (".mp4", ".mov", ".webm")
+
+
+def _author_from_sidecar(sidecar: Path) -> str | None:
+    try:
+        data = json.loads(sidecar.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    author = data.get("author")
+    if isinstance(author, list):
+        return author[0] if author else None
+    return author or None
+
+
+def _author_from_db(conn: sqlite3.Connection | None, file_path: str) -> str | None:
+    if conn is None:
+        return None
+    row = conn.execute(
+        "SELECT author FROM ingested_content WHERE file_path = ? LIMIT 1", (file_path,)
+    ).fetchone()
+    if row and row[0]:
+        return row[0].split(",")[0]
+    return None
+
+
+def plan_migration(root: str | Path = INSTAGRAM_DIR,
+                   conn: sqlite3.Connection | None = None) -> List[Tuple[Path, Path]]:
+    """Return (old, new) moves for every flat file under *root*."""
+    root = Path(root)
+    groups: Dict[str, List[Path]] = defaultdict(list)
+    with os.scandir(root) as it:
+        for entry in it:
+            if entry.is_file(follow_symlinks=False) and split_media_name(entry.name):
+                groups[Path(entry.name).stem].append(Path(entry.path))
+
+    moves: List[Tuple[Path, Path]] = []
+    for stem, files in groups.items():
+        _post_id, ts = split_media_name(stem)
+        sidecar = root / f"{stem}.json"
+        media = next((f for f in files if f.suffix.lower() in MEDIA_SUFFIXES), None)
+        author = _author_from_sidecar(sidecar) if sidecar.exists() else None
+        if author is None and media is not None:
+            author = _author_from_db(conn, str(media.resolve()))
+        target_dir = media_dir_for(author, ts, root)
+        moves.extend((f, target_dir / f.name) for f in files)
+    return moves
+
+
+def _rewrite_sidecar(sidecar: Path) -> None:
+    try:
+        data = json.loads(sidecar.read_text(encoding="utf-8"))
+        if data.get("file_path"):
+            data["file_path"] = str(sidecar.parent.resolve() / Path(data["file_path"]).name)
+            sidecar.write_text(json.dumps(data, indent=2, ensure_ascii=False), encoding="utf-8")
+    except (OSError, ValueError):
+        logger.exception("Could not rewrite sidecar {}", sidecar)
+
+
+def _restore_paths(root: Path, conn: sqlite3.Connection) -> int:
+    """Point catalog rows left at vanished flat paths to their already-moved files."""
+    flat = str(root.resolve())
+    stale = [
+        (row_id, file_path)
+        for row_id, file_path in conn.execute(
+            "SELECT id, file_path FROM ingested_content WHERE file_path LIKE ?", (flat + os.sep + "%",)
+        )
+        if os.path.dirname(file_path) == flat and not os.path.exists(file_path)
+    ]
+    if not stale:
+        return 0
+    sharded: Dict[str, str] = {}
+    stack = [entry.path for entry in os.scandir(root) if entry.is_dir(follow_symlinks=False)]
+    while stack:
+        with os.scandir(stack.pop()) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                else:
+                    sharded.setdefault(entry.name, os.path.abspath(entry.path))
+    updates = [(sharded[os.path.basename(fp)], row_id) for row_id, fp in stale if os.path.basename(fp) in sharded]
+    if updates:
+        with conn:
+            conn.executemany("UPDATE ingested_content SET file_path = ? WHERE id = ?", updates)
+        logger.info("Restored {} catalog paths from an interrupted migration", len(updates))
+    return len(updates)
+
+
+def migrate(root: str | Path = INSTAGRAM_DIR,
+            db_path: str | Path = CONTENT_DB_PATH,
+            dry_run: bool = False) -> int:
+    """Apply the migration; returns the number of files moved (or planned)."""
+    conn = sqlite3.connect(db_path) if Path(db_path).exists() else None
+    if conn is not None and not catalog_exists(conn):
+        conn.close()
+        conn = None
+    try:
+        moves = plan_migration(root, conn)
+        if dry_run:
+            for old, new in moves:
+                logger.info("[dry-run] {} -> {}", old, new)
+            return len(moves)
+
+        restored = _restore_paths(root, conn) if conn is not None else 0
+        moved = updated = 0
+        for _stem, group in groupby(moves, key=lambda m: m[0].stem):
+            path_updates: List[Tuple[str, str]] = []
+            for old, new in group:
+                if new.exists():
+                    logger.warning("Destination {} already exists; leaving {} in place", new, old)
+                    continue
+                old_abs = str(old.resolve())
+                new.parent.mkdir(parents=True, exist_ok=True)
+                os.replace(old, new)
+                moved += 1
+                if new.suffix == ".json":
+                    _rewrite_sidecar(new)
+                else:
+                    path_updates.append((str(new.resolve()), old_abs))
+            # commit per post so the catalog never lags more than one move behind
+            if conn is not None and path_updates:
+                with conn:
+                    conn.executemany(
+                        "UPDATE ingested_content SET file_path = ? WHERE file_path = ?", path_updates
+                    )
+                updated += len(path_updates)
+        if updated or restored:
+            bump_catalog_generation()
+        logger.info("Moved {} files; updated {} catalog paths ({} restored)", moved, updated, restored)
+        return moved
+    finally:
+        if conn is not None:
+            conn.close()
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Shard DATA_DIR/instagram by account and month.")
+    parser.add_argument("--root", default=str(INSTAGRAM_DIR), help="Flat Instagram media directory")
+    parser.add_argument("--db", default=str(CONTENT_DB_PATH), help="Path to content.db")
+    parser.add_argument("--dry-run", action="store_true", help="Only print planned moves")
+    args = parser.parse_args(argv)
+    migrate(args.root, args.db, dry_run=args.dry_run)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+"""Targeted ingestion of individual posts/reels without crawling a profile.
+
+Items (post URLs or bare shortcodes) are normalised, de-duplicated against the
+catalog in one indexed query, then classified concurrently – first with the
+HTTP probe, and only for the leftovers in a single headless browser (one page
+per in-flight item).  Videos are downloaded through the scraper's own
+:func:`download_post_video`, so files, sidecars and catalog rows are identical
+to those produced by a profile crawl.
+"""
+from __future__ import annotations
+
+import asyncio
+import re
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+from loguru import logger
+from playwright.async_api import async_playwright
+
+from backend.config import HTTP_PROBE
+from backend.db.db import find_ingested_urls
+from backend.ingestion.instagram_ingestion.http_probe import probe_post
+from backend.ingestion.instagram_ingestion.instagram_scraper import (
+    INSTAGRAM_BASE,
+    POST_KINDS,
+    download_post_video,
+    format_upload_ts,
+    post_id_from_href,
+    post_urls,
+)
+from backend.tracing import span
+
+SHORTCODE_RE = re.compile(r"^[A-Za-z0-9_-]{5,64}$")
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120 Safari/537.36"
+
+
+def normalize_item(item: str) -> Optional[Tuple[str, str]]:
+    """Return (shortcode, canonical post URL) for a URL or shortcode, else None."""
+    item = item.strip()
+    if not item:
+        return None
+    if "/" in item:
+        path = urlparse(item if "://" in item else f"https://{item}").path
+        parts = [p for p in path.split("/") if p]
+        kind = next((p for p in parts if p in POST_KINDS), None)
+        code = post_id_from_href(path) if kind else None
+        if not code or not SHORTCODE_RE.match(code):
+            return None
+        return code, f"{INSTAGRAM_BASE}/{kind}/{code}/"
+    if SHORTCODE_RE.match(item):
+        return item, f"{INSTAGRAM_BASE}/p/{item}/"
+    return None
+
+
+async def _inspect(context, url: str) -> Tuple[str, Optional[str], Optional[int]]:
+    """Async twin of the scraper's per-post inspection: (media_type, video_src, upload_ts)."""
+    page = await context.new_page()
+    try:
+        await page.goto(url, timeout=60000)
+        video_el = await page.query_selector("video")
+        if video_el is None:
+            return "image", None, None
+        video_src = await video_el.get_attribute("src")
+        if not video_src:
+            meta = await page.query_selector("meta[property='og:video']")
+            if meta:
+                video_src = await meta.get_attribute("content")
+        upload_ts = None
+        ts_meta = await page.query_selector("meta[property='og:video:upload_date']")
+        if ts_meta:
+            try:
+                upload_ts = int(await ts_meta.get_attribute("content"))
+            except (TypeError, ValueError):
+                pass
+        return "video", video_src, upload_ts
+    finally:
+        await page.close()
+
+
+async def ingest_posts(items: List[str],
+                       username: Optional[str] = None,
+                       concurrency: int = 4,
+                       *,
+                       skip_ffprobe: bool = False) -> List[Dict]:
+    """Ingest a batch of posts; returns one status dict per input item, in order."""
+    results: List[Dict] = []
+    todo: Dict[str, Dict] = {}  # shortcode -> result dict still to process
+    for item in items:
+        norm = normalize_item(item)
+        if norm is None:
+            results.append({"input": item, "status": "invalid"})
+            continue
+        code, url = norm
+        if code in todo:
+            results.append({"input": item, "post_id": code, "url": url, "status": "duplicate"})
+            continue
+        res = {"input": item, "post_id": code, "url": url, "status": "pending"}
+        todo[code] = res
+        results.append(res)
+
+    with span("dedupe_catalog", cat="sqlite", items=len(todo)):
+        known = find_ingested_urls([u for code in todo for u in post_urls(code)])
+    for code, res in list(todo.items()):
+        hit = next((known[u] for u in post_urls(code) if u in known), None)
+        if hit:
+            res.update(status="exists", file_path=hit)
+            del todo[code]
+
+    sem = asyncio.Semaphore(max(1, concurrency))
+
+    async def finish(res: Dict, media_type: str, video_src: Optional[str], upload_ts: Optional[int]) -> None:
+        if media_type != "video":
+            res["status"] = "not_video"
+            return
+        if not video_src:
+            res["status"] = "no_video_src"
+            return
+        status, path = await asyncio.to_thread(
+            download_post_video, username, res["post_id"], res["url"], video_src,
+            format_upload_ts(upload_ts), skip_ffprobe=skip_ffprobe,
+        )
+        res["status"] = status
+        if path is not None:
+            res["file_path"] = str(path)
+
+    # 1) cheap HTTP probe; items it cannot classify are left for the browser
+    needs_browser: List[Dict] = []
+    if HTTP_PROBE and todo:
+        async def probe_one(res: Dict) -> None:
+            # the download runs under the same slot: `concurrency` bounds downloads too
+            async with sem:
+                probe = await asyncio.to_thread(probe_post, res["url"])
+                if probe is None:
+                    needs_browser.append(res)
+                    return
+                await finish(res, probe.media_type, probe.video_src, probe.upload_ts)
+
+        await asyncio.gather(*(probe_one(res) for res in todo.values()))
+    else:
+        needs_browser = list(todo.values())
+
+    # 2) browser fallback, launched only if something still needs it
+    if needs_browser:
+        async with async_playwright() as p:
+            browser = await p.chromium.launch(headless=True)
+            context = await browser.new_context(user_agent=USER_AGENT, locale="en-US")
+            try:
+                async def inspect_one(res: Dict) -> None:
+                    async with sem:
+                        try:
+                            with span("inspect_post", cat="browser", post_id=res["post_id"]):
+                                media_type, video_src, upload_ts = await _inspect(context, res["url"])
+                        except Exception as e:
+                            logger.exception("Failed to inspect post {}: {}", res["url"], e)
+                            res.update(status="failed", error=str(e))
+                            return
+                        await finish(res, media_type, video_src, upload_ts)
+
+                await asyncio.gather(*(inspect_one(res) for res in needs_browser))
+            finally:
+                await context.close()
+                await browser.close()
+
+    counts: Dict[str, int] = {}
+    for res in results:
+        counts[res["status"]] = counts.get(res["status"], 0) + 1
+    logger.info("Batch ingest of {} items finished: {}", len(items), counts)
+    return results
@@ -10,6 +10,10 @@ from typing import Any, Dict
 
 from loguru import logger
 
+from backend.db.db import CONTENT_DB_PATH, ensure_catalog_table
+from backend.db.generation import bump_catalog_generation
+from backend.tracing import traced
+
 ISO_8601 = "%Y-%m-%dT%H:%M:%SZ"
 
 
@@ -34,7 +38,8 @@ def build_metadata(*,
                    length_seconds: int | None = None,
                    language: str | None = "und",
                    license_: str | None = None,
-                   notes: str | None = None) -> Dict[str, Any]:
+                   notes: str | None = None,
+                   file_size: int | None = None) -> Dict[str, Any]:
     """Return a dict following the canonical metadata schema."""
     return {
         "source_id": str(uuid.uuid4()),
@@ -48,9 +53,11 @@ def build_metadata(*,
         "license": license_,
         "ingest_date": _iso_now(),
         "notes": notes,
+        "file_size": file_size,
     }
 
 
+@traced("write_sidecar", cat="io")
 def write_sidecar(metadata: Dict[str, Any]) -> Path:
     media_path = Path(metadata["file_path"])
     sidecar_path = media_path.with_suffix(".json")
@@ -59,39 +66,23 @@ def write_sidecar(metadata: Dict[str, Any]) -> Path:
     return sidecar_path
 
 
-def insert_metadata_to_db(metadata: Dict[str, Any], db_path: str = "backend/db/content.db") -> None:
+@traced("insert_metadata_to_db", cat="sqlite")
+def insert_metadata_to_db(metadata: Dict[str, Any], db_path: str = str(CONTENT_DB_PATH)) -> None:
     import sqlite3
     Path(db_path).parent.mkdir(parents=True, exist_ok=True)
     conn = sqlite3.connect(db_path)
     try:
-        conn.execute(
-            """
-            CREATE TABLE IF NOT EXISTS ingested_content (
-              id TEXT PRIMARY KEY,
-              source_type TEXT NOT NULL,
-              original_url TEXT NOT NULL,
-              file_path TEXT NOT NULL,
-              publish_date TEXT,
-              author TEXT,
-              length_seconds INTEGER,
-              language TEXT,
-              license TEXT,
-              ingest_date TEXT NOT NULL,
-              notes TEXT,
-              UNIQUE(original_url, file_path) ON CONFLICT IGNORE
-            );
-            """
-        )
-        # indexes for faster lookup
-        conn.execute("CREATE INDEX IF NOT EXISTS idx_ingest_date ON ingested_content(ingest_date);")
-        conn.execute("CREATE INDEX IF NOT EXISTS idx_source_type ON ingested_content(source_type);")
+        ensure_catalog_table(conn)
+        # rollup tables + triggers backing /api/stats
+        from backend.db.stats import ensure_stats_schema
+        ensure_stats_schema(conn)
 
-        conn.execute(
+        cur = conn.execute(
             """
             INSERT OR IGNORE INTO ingested_content (
               id, source_type, original_url, file_path, publish_date, author, length_seconds,
-              language, license, ingest_date, notes)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?);
+              language, license, ingest_date, notes, file_size)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?);
             """,
             (
                 metadata["source_id"],
@@ -105,9 +96,12 @@ def insert_metadata_to_db(metadata: Dict[str, Any], db_path: str = "backend/db/c
                 metadata["license"],
                 metadata["ingest_date"],
                 metadata["notes"],
+                metadata.get("file_size"),
             ),
         )
         conn.commit()
+        if cur.rowcount:
+            bump_catalog_generation()
     except Exception:
         logger.exception("Failed to insert metadata into DB")
     finally:
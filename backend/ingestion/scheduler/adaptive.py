@@ -0,0 +1,164 @@
+"""Adaptive per-account polling.
+
+Instead of scraping every account each ``SCRAPE_INTERVAL`` minutes, the
+scheduler ticks frequently and only scrapes accounts whose ``next_run`` has
+passed.  After every run the account's interval is adjusted:
+
+* new posts found  → interval halves (the account is active right now)
+* nothing new      → interval grows by 1.5×
+* while the account keeps to its usual cadence (median gap between its last
+  posts) the interval is capped at a third of that gap, so an account posting
+  every few hours is never polled only once a day.
+
+The result is clamped to ``[POLL_MIN_MINUTES, POLL_MAX_MINUTES]``.  State and
+history live in ``instagram_posts.db`` next to the ``posts`` table.
+"""
+from __future__ import annotations
+
+import sqlite3
+from datetime import datetime, timedelta
+from statistics import median
+from typing import Dict, Iterable, List, Optional
+
+from loguru import logger
+
+from backend.config import POLL_MAX_MINUTES, POLL_MIN_MINUTES, SCRAPE_INTERVAL
+
+DATE_POSTED_FMT = "%Y%m%dT%H%M%S"
+CADENCE_SAMPLE = 10  # most recent posts used to estimate the posting cadence
+ACTIVE_FACTOR = 0.5
+IDLE_FACTOR = 1.5
+
+SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS account_poll_state (
+    username TEXT PRIMARY KEY,
+    interval_minutes REAL NOT NULL,
+    last_run TEXT,
+    next_run TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS account_poll_history (
+    username TEXT NOT NULL,
+    run_at TEXT NOT NULL,
+    new_posts INTEGER NOT NULL,
+    interval_minutes REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_poll_history_user ON account_poll_history(username, run_at);
+CREATE TABLE IF NOT EXISTS account_post_dates (
+    username TEXT NOT NULL,
+    post_id TEXT NOT NULL,
+    date_posted TEXT NOT NULL,
+    PRIMARY KEY (username, post_id)
+);
+"""
+
+
+def _utcnow() -> datetime:
+    return datetime.utcnow().replace(microsecond=0)
+
+
+def init_schedule_tables(conn: sqlite3.Connection) -> None:
+    conn.executescript(SCHEMA_SQL)
+
+
+def _clamp(minutes: float) -> float:
+    return max(float(POLL_MIN_MINUTES), min(float(POLL_MAX_MINUTES), minutes))
+
+
+def posting_cadence(conn: sqlite3.Connection, username: str) -> Optional[float]:
+    """Median gap in minutes between the account's most recent posts, if known."""
+    rows = conn.execute(
+        "SELECT date_posted FROM account_post_dates WHERE username = ? ORDER BY date_posted DESC LIMIT ?",
+        (username, CADENCE_SAMPLE),
+    ).fetchall()
+    stamps = [datetime.strptime(r[0], DATE_POSTED_FMT) for r in rows]
+    gaps = [(a - b).total_seconds() / 60 for a, b in zip(stamps, stamps[1:]) if a > b]
+    return median(gaps) if gaps else None
+
+
+def _last_post_at(conn: sqlite3.Connection, username: str) -> Optional[datetime]:
+    row = conn.execute(
+        "SELECT MAX(date_posted) FROM account_post_dates WHERE username = ?", (username,)
+    ).fetchone()
+    return datetime.strptime(row[0], DATE_POSTED_FMT) if row and row[0] else None
+
+
+def next_interval(current: float, new_posts: int, cadence: Optional[float],
+                  minutes_since_last_post: Optional[float]) -> float:
+    """Pure interval policy; see module docstring."""
+    interval = current * (ACTIVE_FACTOR if new_posts else IDLE_FACTOR)
+    # Only trust the cadence while the account is keeping to it; a formerly busy
+    # account that went quiet should be allowed to back off.
+    if cadence and minutes_since_last_post is not None and minutes_since_last_post < 3 * cadence:
+        interval = min(interval, cadence / 3)
+    return _clamp(interval)
+
+
+def due_accounts(conn: sqlite3.Connection, accounts: Iterable[str], now: Optional[datetime] = None) -> List[str]:
+    """Accounts whose next_run has passed (or that were never polled)."""
+    now = now or _utcnow()
+    due = []
+    for username in accounts:
+        row = conn.execute(
+            "SELECT next_run FROM account_poll_state WHERE username = ?", (username,)
+        ).fetchone()
+        if row is None or datetime.fromisoformat(row[0]) <= now:
+            due.append(username)
+    return due
+
+
+def record_run(conn: sqlite3.Connection, username: str, posts: List[Dict], new_posts: int,
+               now: Optional[datetime] = None) -> float:
+    """Store this run's outcome and schedule the next poll; returns the new interval."""
+    now = now or _utcnow()
+    with conn:
+        conn.executemany(
+            "INSERT OR IGNORE INTO account_post_dates (username, post_id, date_posted) VALUES (?, ?, ?)",
+            [(username, p["id"], p["date_posted"]) for p in posts if p.get("date_posted")],
+        )
+    row = conn.execute(
+        "SELECT interval_minutes FROM account_poll_state WHERE username = ?", (username,)
+    ).fetchone()
+    current = row[0] if row else float(SCRAPE_INTERVAL)
+    last_post = _last_post_at(conn, username)
+    since_last = (now - last_post).total_seconds() / 60 if last_post else None
+    interval = next_interval(current, new_posts, posting_cadence(conn, username), since_last)
+    next_run = now + timedelta(minutes=interval)
+    with conn:
+        conn.execute(
+            """
+            INSERT INTO account_poll_state (username, interval_minutes, last_run, next_run)
+            VALUES (?, ?, ?, ?)
+            ON CONFLICT (username) DO UPDATE SET
+              interval_minutes = excluded.interval_minutes,
+              last_run = excluded.last_run,
+              next_run = excluded.next_run
+            """,
+            (username, interval, now.isoformat(), next_run.isoformat()),
+        )
+        conn.execute(
+            "INSERT INTO account_poll_history (username, run_at, new_posts, interval_minutes) VALUES (?, ?, ?, ?)",
+            (username, now.isoformat(), new_posts, interval),
+        )
+    logger.info("{}: {} new posts → next poll in {:.0f} min ({})", username, new_posts, interval, next_run.isoformat())
+    return interval
+
+
+def force_poll(conn: sqlite3.Connection, username: str) -> None:
+    """Make *username* due on the next scheduler tick."""
+    now = _utcnow().isoformat()
+    with conn:
+        conn.execute(
+            """
+            INSERT INTO account_poll_state (username, interval_minutes, next_run) VALUES (?, ?, ?)
+            ON CONFLICT (username) DO UPDATE SET next_run = excluded.next_run
+            """,
+            (username, float(SCRAPE_INTERVAL), now),
+        )
+
+
+def schedule_snapshot(conn: sqlite3.Connection) -> List[Dict]:
+    conn.row_factory = sqlite3.Row
+    try:
+        return [dict(r) for r in conn.execute("SELECT * FROM account_poll_state ORDER BY next_run")]
+    finally:
+        conn.row_factory = None
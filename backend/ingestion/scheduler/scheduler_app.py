@@ -7,42 +7,82 @@ from loguru import logger
 
 from backend.config import (
     TARGET_ACCOUNT,
-    SCRAPE_INTERVAL,
+    POLL_TICK_MINUTES,
     LOG_LEVEL,
     MAX_NEW_VIDEOS_PER_RUN,
     DOWNLOAD_DIR,
+    TRACE_KEEP,
 )
 from backend.db.db import init_db, get_connection, get_seen_post_ids, save_new_posts
 from backend.ingestion.instagram_ingestion.instagram_scraper import scrape_account
+from backend.ingestion.scheduler.adaptive import due_accounts, init_schedule_tables, record_run
+from backend.tracing import start_trace, TRACE_DIR
 
 logger.remove()
 logger.add(sys.stderr, level=LOG_LEVEL)
 logger.add("/data/scraper.log", rotation="10 MB", level=LOG_LEVEL, enqueue=True)
 
 
-def scrape_job():
-    logger.info("Running scrape job at {}", datetime.utcnow().isoformat())
+ACCOUNTS = [a.strip() for a in TARGET_ACCOUNT.split(",") if a.strip()]
+
+
+def scrape_account_job(username: str) -> None:
+    """Scrape one account, save new video posts and schedule its next poll."""
+    run_id = f"{username}_{int(datetime.utcnow().timestamp())}"
+    trace = None
+    try:
+        with start_trace(f"scrape:{username}") as trace:
+            _scrape_and_record(username)
+    finally:
+        # written even when the run fails: that is when the trace matters most
+        if trace is not None:
+            trace.write(TRACE_DIR / f"{run_id}.json", keep=TRACE_KEEP)
+
+
+def _scrape_and_record(username: str) -> None:
+    logger.info("Running scrape job for {} at {}", username, datetime.utcnow().isoformat())
     posts = scrape_account(
-        TARGET_ACCOUNT, download=True, max_downloads=MAX_NEW_VIDEOS_PER_RUN
+        username, download=True, max_downloads=MAX_NEW_VIDEOS_PER_RUN
     )
-    if not posts:
-        logger.warning("No posts scraped for {}", TARGET_ACCOUNT)
-        return
-
     conn = get_connection()
-    existing_ids = set(get_seen_post_ids(conn))
+    try:
+        init_schedule_tables(conn)
+        if not posts:
+            logger.warning("No posts scraped for {}", username)
+            record_run(conn, username, [], 0)
+            return
+
+        existing_ids = set(get_seen_post_ids(conn))
+        new_posts = [
+            p
+            for p in posts
+            if p["id"] not in existing_ids and p["media_type"] == "video"
+        ]
+        record_run(conn, username, posts, len(new_posts))
+        new_posts = new_posts[: MAX_NEW_VIDEOS_PER_RUN]
+        if new_posts:
+            save_new_posts(conn, new_posts)
+            for p in new_posts:
+                logger.info("New video found: {url}", **p)
+        else:
+            logger.info("No new videos found or limit reached (max {}).", MAX_NEW_VIDEOS_PER_RUN)
+    finally:
+        conn.close()
 
-    new_posts = [
-        p
-        for p in posts
-        if p["id"] not in existing_ids and p["media_type"] == "video"
-    ][: MAX_NEW_VIDEOS_PER_RUN]
-    if new_posts:
-        save_new_posts(conn, new_posts)
-        for p in new_posts:
-            logger.info("New video found: {url}", **p)
-    else:
-        logger.info("No new videos found or limit reached (max {}).", MAX_NEW_VIDEOS_PER_RUN)
+
+def scrape_job(force: bool = False) -> None:
+    """Scheduler tick: scrape every account whose adaptive next_run has passed."""
+    conn = get_connection()
+    try:
+        init_schedule_tables(conn)
+        due = ACCOUNTS if force else due_accounts(conn, ACCOUNTS)
+    finally:
+        conn.close()
+    for username in due:
+        try:
+            scrape_account_job(username)
+        except Exception:
+            logger.exception("Scrape job failed for {}", username)
 
 
 def main():
@@ -51,7 +91,7 @@ def main():
     scheduler.add_job(
         scrape_job,
         "interval",
-        minutes=SCRAPE_INTERVAL,
+        minutes=POLL_TICK_MINUTES,
         next_run_time=datetime.utcnow(),
     )
 
@@ -64,9 +104,9 @@ def main():
     signal.signal(signal.SIGTERM, shutdown)
 
     logger.info(
-        "Starting scheduler for account {} every {} minutes. Download dir: {}",
-        TARGET_ACCOUNT,
-        SCRAPE_INTERVAL,
+        "Starting adaptive scheduler for {} (checked every {} minutes). Download dir: {}",
+        ", ".join(ACCOUNTS),
+        POLL_TICK_MINUTES,
         DOWNLOAD_DIR,
     )
     scheduler.start()
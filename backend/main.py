@@ -1,5 +1,5 @@
 """Main FastAPI application entrypoint with scheduler integration and static files."""
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.staticfiles import StaticFiles
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from datetime import datetime
@@ -7,7 +7,9 @@ import os, pathlib
 
 from backend.api.routes import router as api_router
 from backend.ingestion.scheduler.scheduler_app import scrape_job
-from backend.config import SCRAPE_INTERVAL
+from backend.config import POLL_TICK_MINUTES, TRACE_API, RETENTION_MAX_BYTES, RETENTION_SWEEP_MINUTES
+from backend.media.retention import run_retention_sweep, touch_static_path
+from backend.tracing import API_TRACE, span, use_trace
 
 app = FastAPI(title="Headless Browser API", version="1.0.0")
 
@@ -18,6 +20,16 @@ DATA_DIR = os.getenv("DATA_DIR", "./data")
 pathlib.Path(DATA_DIR).mkdir(parents=True, exist_ok=True)
 app.mount("/static", StaticFiles(directory=DATA_DIR), name="static")
 
+if RETENTION_MAX_BYTES > 0:
+    # Only the retention sweep flushes the access map, so only track when it runs.
+    @app.middleware("http")
+    async def _record_static_access(request: Request, call_next):
+        """Feed video accesses to the retention manager's LRU bookkeeping."""
+        response = await call_next(request)
+        if request.url.path.startswith("/static/") and response.status_code in (200, 206):
+            touch_static_path(request.url.path)
+        return response
+
 # ---------------------------------------------------------------------------
 # Background scheduler (runs inside event loop)
 # ---------------------------------------------------------------------------
@@ -25,13 +37,27 @@ scheduler = AsyncIOScheduler()
 
 @app.on_event("startup")
 async def _startup():
-    scheduler.add_job(scrape_job, "interval", minutes=SCRAPE_INTERVAL, next_run_time=datetime.utcnow())
+    # Ticks are cheap; each account is only scraped once its adaptive next_run is due.
+    scheduler.add_job(scrape_job, "interval", minutes=POLL_TICK_MINUTES, next_run_time=datetime.utcnow())
+    if RETENTION_MAX_BYTES > 0:
+        scheduler.add_job(run_retention_sweep, "interval", minutes=RETENTION_SWEEP_MINUTES)
     scheduler.start()
 
 @app.on_event("shutdown")
 async def _shutdown():
     scheduler.shutdown(wait=False)
 
+# ---------------------------------------------------------------------------
+# Optional request tracing  (GET /api/traces/api → Chrome trace JSON)
+# ---------------------------------------------------------------------------
+if TRACE_API:
+    @app.middleware("http")
+    async def _trace_requests(request: Request, call_next):
+        with use_trace(API_TRACE), span(f"{request.method} {request.url.path}", cat="api") as sp:
+            response = await call_next(request)
+            sp["status"] = response.status_code
+        return response
+
 # ---------------------------------------------------------------------------
 # Routers & simple health endpoint
 # ---------------------------------------------------------------------------
@@ -0,0 +1,246 @@
+"""Poster frames and low-bitrate previews for downloaded videos.
+
+Every video gets a small JPEG poster and a short, silent, low-bitrate MP4
+preview generated by ``ffmpeg`` in a bounded worker pool.  Results are cached
+under ``DATA_DIR/previews`` keyed by the media file path *and* its mtime, so a
+re-downloaded or moved file is regenerated automatically while untouched files
+are never processed twice.  The key is also stored in the catalog row
+(``preview_key``) so that posters keep resolving after retention evicts the
+video itself.
+
+Backfill existing downloads with::
+
+    python -m backend.media.previews --backfill
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import os
+import sqlite3
+import subprocess
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Tuple
+
+from loguru import logger
+
+from backend.config import PREVIEW_WORKERS
+from backend.db.db import CONTENT_DB_PATH, catalog_exists, ensure_catalog_columns
+from backend.db.generation import bump_catalog_generation
+
+DATA_DIR = os.getenv("DATA_DIR", "./data")
+PREVIEW_DIR = Path(DATA_DIR) / "previews"
+MEDIA_DIR = Path(DATA_DIR) / "instagram"
+
+VIDEO_SUFFIXES = (".mp4", ".mov", ".webm")
+POSTER_WIDTH = 320
+PREVIEW_WIDTH = 240
+PREVIEW_SECONDS = 6
+FFMPEG_TIMEOUT = 120
+
+
+def paths_for_key(key: str) -> Tuple[Path, Path]:
+    """(poster, preview) cache paths for a preview key."""
+    shard = PREVIEW_DIR / key[:2]
+    return shard / f"{key}.jpg", shard / f"{key}.mp4"
+
+
+def cache_paths(media_path: str | Path) -> Optional[Tuple[Path, Path]]:
+    """Return (poster, preview) cache paths for *media_path*, or None if it is gone."""
+    media_path = Path(media_path)
+    try:
+        st = media_path.stat()
+    except OSError:
+        return None
+    key = hashlib.sha1(f"{media_path.resolve()}:{st.st_mtime_ns}".encode("utf-8")).hexdigest()[:24]
+    return paths_for_key(key)
+
+
+def _record_preview_key(media_path: str | Path, key: str, db_path: str | Path = CONTENT_DB_PATH) -> None:
+    """Remember *key* on the catalog row of *media_path* (if it is catalogued)."""
+    db_path = Path(db_path)
+    if not db_path.exists():
+        return
+    conn = sqlite3.connect(db_path)
+    try:
+        if not catalog_exists(conn):
+            return
+        ensure_catalog_columns(conn)
+        with conn:
+            conn.execute(
+                "UPDATE ingested_content SET preview_key = ? WHERE file_path IN (?, ?)",
+                (key, str(media_path), str(Path(media_path).resolve())),
+            )
+    finally:
+        conn.close()
+
+
+def _run_ffmpeg(args: list[str], dest: Path) -> bool:
+    """Run ffmpeg writing to a temp file, then atomically move it into place."""
+    tmp = dest.with_name(dest.stem + ".tmp" + dest.suffix)
+    cmd = ["ffmpeg", "-y", "-v", "error", *args, str(tmp)]
+    try:
+        proc = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                              timeout=FFMPEG_TIMEOUT, text=True)
+    except FileNotFoundError:
+        logger.warning("ffmpeg not found; cannot generate {}", dest.name)
+        return False
+    except subprocess.TimeoutExpired:
+        logger.warning("ffmpeg timed out generating {}", dest.name)
+        tmp.unlink(missing_ok=True)
+        return False
+    if proc.returncode != 0:
+        logger.warning("ffmpeg non-zero exit for {}: {}", dest.name, proc.stdout.strip())
+        tmp.unlink(missing_ok=True)
+        return False
+    os.replace(tmp, dest)
+    return True
+
+
+def generate_previews(media_path: str | Path) -> Optional[Tuple[Path, Path]]:
+    """Generate (or reuse cached) poster + preview for one video. Blocking."""
+    paths = cache_paths(media_path)
+    if paths is None:
+        logger.debug("Skipping previews for missing file {}", media_path)
+        return None
+    poster, preview = paths
+    poster.parent.mkdir(parents=True, exist_ok=True)
+    src = str(media_path)
+    if not poster.exists():
+        _run_ffmpeg(
+            ["-i", src, "-vf", f"thumbnail,scale={POSTER_WIDTH}:-2", "-frames:v", "1", "-q:v", "5"],
+            poster,
+        )
+    if not preview.exists():
+        _run_ffmpeg(
+            ["-i", src, "-t", str(PREVIEW_SECONDS), "-an", "-vf", f"scale={PREVIEW_WIDTH}:-2",
+             "-c:v", "libx264", "-preset", "veryfast", "-crf", "32", "-maxrate", "200k",
+             "-bufsize", "400k", "-movflags", "+faststart"],
+            preview,
+        )
+    if poster.exists() and preview.exists():
+        logger.debug("Previews ready for {}", media_path)
+        _record_preview_key(media_path, poster.stem)
+        # listing responses embed preview URLs
+        bump_catalog_generation()
+    return poster, preview
+
+
+def preview_urls(media_path: str | Path | None, preview_key: str | None = None) -> Dict[str, Optional[str]]:
+    """Map a media file to the ``/static`` URLs of its cached previews (None if not ready).
+
+    A stored *preview_key* wins, so previews of evicted videos still resolve.
+    """
+    urls: Dict[str, Optional[str]] = {"thumbnail_url": None, "preview_url": None}
+    if preview_key:
+        paths = paths_for_key(preview_key)
+    else:
+        paths = cache_paths(media_path) if media_path else None
+    if paths is None:
+        return urls
+    root = PREVIEW_DIR.parent.resolve()
+    for field, path in zip(("thumbnail_url", "preview_url"), paths):
+        if path.exists():
+            urls[field] = "/static/" + path.resolve().relative_to(root).as_posix()
+    return urls
+
+
+def iter_videos(root: str | Path = MEDIA_DIR) -> Iterator[Path]:
+    """Recursively yield video files under *root* using os.scandir."""
+    stack = [Path(root)]
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(Path(entry.path))
+                    elif entry.name.lower().endswith(VIDEO_SUFFIXES):
+                        yield Path(entry.path)
+        except FileNotFoundError:
+            continue
+
+
+class PreviewService:
+    """Bounded pool of ffmpeg workers; de-duplicates in-flight requests."""
+
+    def __init__(self, max_workers: int = PREVIEW_WORKERS):
+        self._executor = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="preview")
+        self._pending: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, media_path: str | Path) -> Optional[Future]:
+        """Queue preview generation unless cached or already queued."""
+        paths = cache_paths(media_path)
+        if paths is None or all(p.exists() for p in paths):
+            return None
+        key = str(paths[0])
+        with self._lock:
+            fut = self._pending.get(key)
+            if fut is not None:
+                return fut
+            fut = self._executor.submit(self._run, media_path)
+            self._pending[key] = fut
+        fut.add_done_callback(lambda _f: self._forget(key))
+        return fut
+
+    def _forget(self, key: str) -> None:
+        with self._lock:
+            self._pending.pop(key, None)
+
+    @staticmethod
+    def _run(media_path: str | Path):
+        try:
+            return generate_previews(media_path)
+        except Exception:
+            logger.exception("Preview generation failed for {}", media_path)
+            return None
+
+    def backfill(self, root: str | Path = MEDIA_DIR) -> int:
+        """Queue every video under *root* that has no cached previews; returns count."""
+        queued = 0
+        for video in iter_videos(root):
+            if self.submit(video) is not None:
+                queued += 1
+        logger.info("Queued {} videos for preview backfill under {}", queued, root)
+        return queued
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._executor.shutdown(wait=wait)
+
+
+_service: Optional[PreviewService] = None
+_service_lock = threading.Lock()
+
+
+def get_preview_service() -> PreviewService:
+    global _service
+    with _service_lock:
+        if _service is None:
+            _service = PreviewService()
+        return _service
+
+
+def schedule_previews(media_path: str | Path) -> None:
+    """Fire-and-forget hook for the download path."""
+    get_preview_service().submit(media_path)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Generate video posters and previews.")
+    parser.add_argument("--backfill", action="store_true", help="Process every video under DATA_DIR/instagram")
+    parser.add_argument("paths", nargs="*", help="Individual video files to process")
+    args = parser.parse_args(argv)
+
+    service = get_preview_service()
+    if args.backfill:
+        service.backfill()
+    for path in args.paths:
+        service.submit(path)
+    service.shutdown(wait=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,212 @@
+"""Disk-quota-aware retention for ``DATA_DIR``.
+
+When the data volume grows beyond ``RETENTION_MAX_BYTES`` the sweep deletes
+catalogued *video* files until usage drops below a low-water mark, choosing
+victims by policy:
+
+* ``lru``     – least recently accessed first (falls back to ingest_date)
+* ``largest`` – biggest files first
+
+Catalog rows, JSON sidecars, derived audio and previews are always kept (poster
+URLs keep resolving through the row's ``preview_key``); evicted rows are
+flagged ``evicted = 1`` and rows with ``pinned = 1`` are never touched.
+Access times are recorded in memory by the ``/static`` middleware and written
+to ``ingested_content.last_accessed`` at the start of each sweep.  Run logs and
+traces older than ``RETENTION_LOG_DAYS`` are pruned as well.
+"""
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict
+
+from loguru import logger
+
+from backend.config import RETENTION_LOG_DAYS, RETENTION_MAX_BYTES, RETENTION_POLICY
+from backend.db.db import CONTENT_DB_PATH, catalog_exists, ensure_catalog_columns
+from backend.db.generation import bump_catalog_generation
+from backend.tracing import traced
+
+DATA_DIR = Path(os.getenv("DATA_DIR", "./data"))
+LOG_DIR = Path("logs")
+VIDEO_SUFFIXES = (".mp4", ".mov", ".webm")
+# Evict down to this fraction of the quota so that a sweep isn't needed after every download.
+LOW_WATER_MARK = 0.9
+
+_ORDER_BY = {
+    "lru": "COALESCE(last_accessed, ingest_date) ASC",
+    "largest": "file_size DESC",
+}
+
+
+def _iso_now() -> str:
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+class AccessTracker:
+    """In-memory ``file_path → last access`` map, flushed to SQLite in batches."""
+
+    def __init__(self):
+        self._seen: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def touch(self, file_path: str | Path) -> None:
+        with self._lock:
+            self._seen[str(file_path)] = _iso_now()
+
+    def flush(self, conn: sqlite3.Connection) -> int:
+        with self._lock:
+            seen, self._seen = self._seen, {}
+        if seen:
+            with conn:
+                conn.executemany(
+                    "UPDATE ingested_content SET last_accessed = ? WHERE file_path = ?",
+                    [(ts, path) for path, ts in seen.items()],
+                )
+        return len(seen)
+
+
+access_tracker = AccessTracker()
+
+
+def touch_static_path(url_path: str) -> None:
+    """Record an access to ``/static/<rel>`` if it refers to a video file."""
+    rel = url_path.split("/static/", 1)[-1]
+    if rel.lower().endswith(VIDEO_SUFFIXES):
+        access_tracker.touch((DATA_DIR / rel).resolve())
+
+
+def disk_usage(root: str | Path = DATA_DIR) -> int:
+    """Total bytes of regular files under *root* (os.scandir walk)."""
+    total = 0
+    stack = [str(root)]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        total += entry.stat(follow_symlinks=False).st_size
+        except FileNotFoundError:
+            continue
+    return total
+
+
+def _backfill_sizes(conn: sqlite3.Connection) -> None:
+    """Fill file_size for rows catalogued before the column existed."""
+    rows = conn.execute(
+        "SELECT id, file_path FROM ingested_content WHERE file_size IS NULL AND evicted = 0"
+    ).fetchall()
+    updates = []
+    for row_id, file_path in rows:
+        try:
+            updates.append((os.stat(file_path).st_size, row_id))
+        except OSError:
+            updates.append((0, row_id))
+    if updates:
+        with conn:
+            conn.executemany("UPDATE ingested_content SET file_size = ? WHERE id = ?", updates)
+
+
+def prune_logs(max_age_days: int = RETENTION_LOG_DAYS, log_dir: Path = LOG_DIR) -> int:
+    """Delete run summaries and traces older than *max_age_days*."""
+    if max_age_days <= 0 or not log_dir.exists():
+        return 0
+    cutoff = time.time() - max_age_days * 86400
+    removed = 0
+    for directory in (log_dir, log_dir / "traces"):
+        if not directory.exists():
+            continue
+        for entry in os.scandir(directory):
+            if entry.is_file() and entry.name.endswith((".json", ".zip")) and entry.stat().st_mtime < cutoff:
+                os.unlink(entry.path)
+                removed += 1
+    return removed
+
+
+@traced("retention_sweep", cat="retention")
+def run_retention_sweep(max_bytes: int = RETENTION_MAX_BYTES,
+                        policy: str = RETENTION_POLICY,
+                        db_path: str | Path = CONTENT_DB_PATH,
+                        data_dir: str | Path = DATA_DIR,
+                        log_dir: str | Path = LOG_DIR) -> Dict[str, int]:
+    """Evict videos until DATA_DIR fits the quota; returns a summary dict."""
+    summary = {"usage_bytes": 0, "evicted": 0, "freed_bytes": 0, "logs_pruned": prune_logs(log_dir=Path(log_dir))}
+    db_path = Path(db_path)
+    if not db_path.exists():
+        return summary
+    conn = sqlite3.connect(db_path)
+    try:
+        if not catalog_exists(conn):
+            return summary
+        ensure_catalog_columns(conn)
+        access_tracker.flush(conn)
+        usage = disk_usage(data_dir)
+        summary["usage_bytes"] = usage
+        if max_bytes <= 0 or usage <= max_bytes:
+            return summary
+
+        _backfill_sizes(conn)
+        target = int(max_bytes * LOW_WATER_MARK)
+        order_by = _ORDER_BY.get(policy, _ORDER_BY["lru"])
+        suffix_filter = " OR ".join("lower(file_path) LIKE ?" for _ in VIDEO_SUFFIXES)
+        cur = conn.execute(
+            f"SELECT id, file_path, file_size FROM ingested_content "
+            f"WHERE evicted = 0 AND pinned = 0 AND ({suffix_filter}) ORDER BY {order_by}",
+            [f"%{s}" for s in VIDEO_SUFFIXES],
+        )
+        evicted_ids = []
+        for row_id, file_path, file_size in cur:
+            if usage <= target:
+                break
+            try:
+                size = os.stat(file_path).st_size
+                os.unlink(file_path)
+            except FileNotFoundError:
+                size = 0
+            except OSError:
+                logger.exception("Could not evict {}", file_path)
+                continue
+            usage -= size
+            summary["freed_bytes"] += size
+            evicted_ids.append((row_id,))
+        if evicted_ids:
+            with conn:
+                conn.executemany("UPDATE ingested_content SET evicted = 1 WHERE id = ?", evicted_ids)
+            bump_catalog_generation()
+        summary["evicted"] = len(evicted_ids)
+        summary["usage_bytes"] = usage
+        logger.info(
+            "Retention sweep ({}): evicted {} videos, freed {} bytes, usage now {} / {}",
+            policy, summary["evicted"], summary["freed_bytes"], usage, max_bytes,
+        )
+        return summary
+    finally:
+        conn.close()
+
+
+def set_pinned(source_id: str, pinned: bool, db_path: str | Path = CONTENT_DB_PATH) -> bool:
+    """Pin/unpin a catalog row; returns False if the id is unknown."""
+    db_path = Path(db_path)
+    if not db_path.exists():
+        return False
+    conn = sqlite3.connect(db_path)
+    try:
+        if not catalog_exists(conn):
+            return False
+        ensure_catalog_columns(conn)
+        with conn:
+            cur = conn.execute(
+                "UPDATE ingested_content SET pinned = ? WHERE id = ?", (1 if pinned else 0, source_id)
+            )
+        if cur.rowcount > 0:
+            bump_catalog_generation()
+            return True
+        return False
+    finally:
+        conn.close()
@@ -0,0 +1,157 @@
+"""Span-based tracing exported as Chrome trace-event JSON (opens in Perfetto).
+
+A :class:`Trace` collects complete ("X") events.  The active trace is held in a
+``ContextVar`` so it follows ``asyncio.to_thread`` into the scraper thread;
+:func:`span` is a no-op when no trace is active, so instrumented code costs
+nothing outside a traced run.
+
+    with start_trace("scrape:someuser") as trace:
+        with span("navigate", url=url):
+            ...
+    trace.write(TRACE_DIR / "someuser.json")
+"""
+from __future__ import annotations
+
+import functools
+import inspect
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional
+
+TRACE_DIR = Path("logs") / "traces"
+
+_current: ContextVar[Optional["Trace"]] = ContextVar("current_trace", default=None)
+
+
+def _now_us() -> int:
+    return time.perf_counter_ns() // 1000
+
+
+class Trace:
+    """Thread-safe collection of trace events.
+
+    ``max_events`` turns the trace into a ring buffer, used for the long-lived
+    API trace.
+    """
+
+    def __init__(self, name: str, max_events: Optional[int] = None):
+        self.name = name
+        self.started = _now_us()
+        self._events: deque = deque(maxlen=max_events)
+        self._threads: Dict[int, str] = {}
+        self._lock = threading.Lock()
+
+    def add(self, name: str, cat: str, ts: int, dur: int, args: Dict[str, Any]) -> None:
+        tid = threading.get_native_id()
+        event = {"name": name, "cat": cat, "ph": "X", "ts": ts, "dur": dur,
+                 "pid": os.getpid(), "tid": tid}
+        if args:
+            event["args"] = args
+        with self._lock:
+            self._events.append(event)
+            self._threads.setdefault(tid, threading.current_thread().name)
+
+    def to_chrome(self) -> Dict[str, Any]:
+        with self._lock:
+            events = list(self._events)
+            threads = dict(self._threads)
+        pid = os.getpid()
+        meta = [{"name": "process_name", "ph": "M", "pid": pid, "args": {"name": self.name}}]
+        meta += [
+            {"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": tname}}
+            for tid, tname in threads.items()
+        ]
+        return {"traceEvents": meta + events, "displayTimeUnit": "ms"}
+
+    def write(self, path: str | Path, keep: Optional[int] = None) -> Path:
+        """Write the Chrome JSON; with *keep*, prune all but the newest *keep* traces beside it."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.to_chrome()))
+        if keep:
+            _prune_traces(path.parent, keep)
+        return path
+
+
+def _prune_traces(directory: Path, keep: int) -> None:
+    traces = sorted(
+        (e for e in os.scandir(directory) if e.is_file() and e.name.endswith(".json")),
+        key=lambda e: e.stat().st_mtime,
+        reverse=True,
+    )
+    for entry in traces[keep:]:
+        try:
+            os.unlink(entry.path)
+        except FileNotFoundError:
+            pass
+
+
+# Rolling buffer of API request spans, filled by the middleware when TRACE_API=1.
+API_TRACE = Trace("api", max_events=20000)
+
+
+def current_trace() -> Optional[Trace]:
+    return _current.get()
+
+
+@contextmanager
+def use_trace(trace: Optional[Trace]) -> Iterator[Optional[Trace]]:
+    """Make *trace* the active trace for the enclosed block."""
+    token = _current.set(trace)
+    try:
+        yield trace
+    finally:
+        _current.reset(token)
+
+
+@contextmanager
+def start_trace(name: str) -> Iterator[Trace]:
+    """Create a new trace, activate it and wrap the block in a root span."""
+    trace = Trace(name)
+    with use_trace(trace), span(name, cat="run"):
+        yield trace
+
+
+@contextmanager
+def span(name: str, cat: str = "app", **args: Any) -> Iterator[Dict[str, Any]]:
+    """Record the enclosed block as a complete event on the active trace.
+
+    Yields the args dict so callers can attach results (e.g. byte counts).
+    """
+    trace = _current.get()
+    if trace is None:
+        yield args
+        return
+    start = _now_us()
+    try:
+        yield args
+    finally:
+        trace.add(name, cat, start, _now_us() - start, args)
+
+
+def traced(name: Optional[str] = None, cat: str = "app"):
+    """Decorator form of :func:`span` for sync and async functions."""
+
+    def decorator(fn):
+        span_name = name or fn.__qualname__
+
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*a, **kw):
+                with span(span_name, cat):
+                    return await fn(*a, **kw)
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*a, **kw):
+            with span(span_name, cat):
+                return fn(*a, **kw)
+        return wrapper
+
+    return decorator
@@ -14,3 +14,31 @@ export async function getMetadata({ limit = 50, offset = 0, source_type = null }
   }
   return res.json();
 }
+
+/*
+ * Cursor page in compact mode: the server sends {fields, rows: [[...]], next_cursor}
+ * and we zip it back into objects holding only the requested columns.
+ */
+export async function getMetadataPage({ cursor = null, limit = 200, source_type = null, fields = [], signal } = {}) {
+  const base = process.env.REACT_APP_API_BASE || 'http://localhost:8000';
+  const params = new URLSearchParams({ limit, compact: 'true' });
+  if (cursor) params.append('cursor', cursor);
+  if (fields.length) params.append('fields', fields.join(','));
+  if (source_type && source_type !== 'all') params.append('source_type', source_type);
+
+  const url = `${base}/api/metadata?${params.toString()}`;
+  const res = await fetch(url, { signal });
+  if (!res.ok) {
+    const text = await res.text();
+    throw new Error(`Failed to fetch metadata: ${res.status} ${text}`);
+  }
+  const data = await res.json();
+  const records = data.rows.map((row) => {
+    const r = {};
+    data.fields.forEach((f, i) => {
+      r[f] = row[i];
+    });
+    return r;
+  });
+  return { records, nextCursor: data.next_cursor };
+}
@@ -1,5 +1,6 @@
-import React, { useState, useEffect, useCallback } from 'react';
-import { getMetadata } from '../api/client';
+import React, { useState, useEffect, useCallback, useRef, memo } from 'react';
+import { getMetadataPage } from '../api/client';
+import MetadataModal from './MetadataModal';
 
 const sourceOptions = [
   { value: 'all', label: 'All' },
@@ -9,7 +10,18 @@ const sourceOptions = [
   { value: 'epub', label: 'EPUB' },
 ];
 
-const limits = [25, 50, 100];
+const apiBase = process.env.REACT_APP_API_BASE || 'http://localhost:8000';
+
+// Only the columns rendered below are requested (compact mode).
+const FIELDS = [
+  'id', 'ingest_date', 'source_type', 'author', 'original_url', 'file_path',
+  'publish_date', 'length_seconds', 'notes', 'thumbnail_url', 'preview_url',
+];
+const COLUMN_COUNT = 10;
+const PAGE_SIZE = 200;
+const ROW_HEIGHT = 56; // px; every row is clamped to this so offsets are arithmetic
+const OVERSCAN = 10; // rows rendered above/below the viewport
+const LOAD_AHEAD = 100; // fetch the next page when this close to the loaded end
 
 function truncateMiddle(text, max = 40) {
   if (text.length <= max) return text;
@@ -17,37 +29,205 @@ function truncateMiddle(text, max = 40) {
   return `${text.slice(0, half)}…${text.slice(-half)}`;
 }
 
-import MetadataModal from './MetadataModal';
+function staticUrl(filePath) {
+  return filePath.replace(/.*data[\\/]/, '/static/').replace(/\\/g, '/');
+}
+
+const Row = memo(function Row({ r, onShowJson }) {
+  return (
+    <tr className="hover:bg-gray-50" style={{ height: ROW_HEIGHT }}>
+      <td className="p-1 border">
+        {r.thumbnail_url ? (
+          <a href={apiBase + (r.preview_url || r.thumbnail_url)} target="_blank" rel="noreferrer">
+            <img
+              src={apiBase + r.thumbnail_url}
+              alt="thumbnail"
+              loading="lazy"
+              className="h-12 w-20 object-cover rounded"
+            />
+          </a>
+        ) : (
+          <span className="text-gray-400">–</span>
+        )}
+      </td>
+      <td className="p-2 border whitespace-nowrap">{r.ingest_date}</td>
+      <td className="p-2 border">{r.source_type}</td>
+      <td className="p-2 border truncate max-w-[10rem]">{r.author}</td>
+      <td className="p-2 border text-blue-600 underline">
+        <a href={r.original_url} target="_blank" rel="noreferrer">
+          link
+        </a>
+      </td>
+      <td className="p-2 border whitespace-nowrap" title={r.file_path}>
+        {truncateMiddle(r.file_path)}
+      </td>
+      <td className="p-2 border whitespace-nowrap">{r.publish_date || '-'}</td>
+      <td className="p-2 border text-right">{r.length_seconds ?? '-'}</td>
+      <td className="p-2 border truncate max-w-xs" title={r.notes || ''}>{r.notes || ''}</td>
+      <td className="p-2 border text-center space-x-2 whitespace-nowrap">
+        {/* Download button */}
+        <a
+          href={staticUrl(r.file_path)}
+          target="_blank"
+          rel="noreferrer"
+          title="Download file"
+          className="text-green-600 hover:underline"
+        >
+          ⬇
+        </a>
+        {/* View JSON */}
+        <button title="View JSON metadata" onClick={() => onShowJson(r)}>
+          ℹ
+        </button>
+      </td>
+    </tr>
+  );
+});
 
 export default function MetadataTable() {
   const [records, setRecords] = useState([]);
-  const [limit, setLimit] = useState(50);
-  const [offset, setOffset] = useState(0);
+  const [nextCursor, setNextCursor] = useState(null);
   const [sourceType, setSourceType] = useState('all');
   const [loading, setLoading] = useState(false);
   const [error, setError] = useState(null);
+  const [scrollTop, setScrollTop] = useState(0);
+  const [viewportHeight, setViewportHeight] = useState(600);
   const [modalOpen, setModalOpen] = useState(false);
   const [modalData, setModalData] = useState(null);
 
-  const fetchData = useCallback(async () => {
-    setLoading(true);
-    setError(null);
-    try {
-      const data = await getMetadata({ limit, offset, source_type: sourceType });
-      setRecords(data.records || []);
-    } catch (e) {
-      setError(e.message);
-    } finally {
-      setLoading(false);
-    }
-  }, [limit, offset, sourceType]);
+  const scrollerRef = useRef(null);
+  const frameRef = useRef(null);
+  const epochRef = useRef(0); // bumped on every reset; stale responses are dropped
+  const loadingRef = useRef(false);
+  const prefetchRef = useRef(null); // { cursor, promise } for the page after the last loaded one
+  const abortRef = useRef(null); // aborts every in-flight page request of the current epoch
+
+  const requestPage = useCallback(
+    (cursor) =>
+      getMetadataPage({
+        cursor,
+        limit: PAGE_SIZE,
+        source_type: sourceType,
+        fields: FIELDS,
+        signal: abortRef.current ? abortRef.current.signal : undefined,
+      }),
+    [sourceType],
+  );
+
+  const prefetch = useCallback(
+    (cursor) => {
+      if (!cursor || (prefetchRef.current && prefetchRef.current.cursor === cursor)) return;
+      const promise = requestPage(cursor);
+      const entry = { cursor, promise };
+      // A failed prefetch must not be reused: drop it so the next load refetches.
+      // The error itself is reported if and when the page is consumed.
+      promise.catch(() => {
+        if (prefetchRef.current === entry) prefetchRef.current = null;
+      });
+      prefetchRef.current = entry;
+    },
+    [requestPage],
+  );
+
+  const loadPage = useCallback(
+    async (cursor) => {
+      if (loadingRef.current) return;
+      const epoch = epochRef.current;
+      loadingRef.current = true;
+      setLoading(true);
+      setError(null);
+      try {
+        const pending = prefetchRef.current;
+        if (pending && pending.cursor === cursor) prefetchRef.current = null;
+        const page = await (pending && pending.cursor === cursor ? pending.promise : requestPage(cursor));
+        if (epoch !== epochRef.current) return;
+        setRecords((prev) => (cursor ? prev.concat(page.records) : page.records));
+        setNextCursor(page.nextCursor);
+        // warm the following page while the user is still reading this one
+        prefetch(page.nextCursor);
+      } catch (e) {
+        if (epoch === epochRef.current) setError(e.message);
+      } finally {
+        if (epoch === epochRef.current) {
+          loadingRef.current = false;
+          setLoading(false);
+        }
+      }
+    },
+    [requestPage, prefetch],
+  );
+
+  const refresh = useCallback(() => {
+    epochRef.current += 1;
+    // responses of the previous epoch would be dropped anyway; stop downloading them
+    if (abortRef.current) abortRef.current.abort();
+    abortRef.current = new AbortController();
+    loadingRef.current = false;
+    prefetchRef.current = null;
+    setRecords([]);
+    setNextCursor(null);
+    setScrollTop(0);
+    if (scrollerRef.current) scrollerRef.current.scrollTop = 0;
+    loadPage(null);
+  }, [loadPage]);
 
   useEffect(() => {
-    fetchData();
-  }, [fetchData]);
+    refresh();
+  }, [refresh]);
 
-  const nextPage = () => setOffset(offset + limit);
-  const prevPage = () => setOffset(Math.max(0, offset - limit));
+  useEffect(
+    () => () => {
+      if (abortRef.current) abortRef.current.abort();
+    },
+    [],
+  );
+
+  // The scroller only mounts once there are records, so measure it from its ref callback.
+  const setScroller = useCallback((node) => {
+    scrollerRef.current = node;
+    if (node) setViewportHeight(node.clientHeight);
+  }, []);
+
+  useEffect(() => {
+    const measure = () => {
+      if (scrollerRef.current) setViewportHeight(scrollerRef.current.clientHeight);
+    };
+    window.addEventListener('resize', measure);
+    return () => window.removeEventListener('resize', measure);
+  }, []);
+
+  const onScroll = () => {
+    if (frameRef.current) return;
+    frameRef.current = requestAnimationFrame(() => {
+      frameRef.current = null;
+      if (!scrollerRef.current) return;
+      setScrollTop(scrollerRef.current.scrollTop);
+      setViewportHeight(scrollerRef.current.clientHeight);
+    });
+  };
+
+  const first = Math.max(0, Math.floor(scrollTop / ROW_HEIGHT) - OVERSCAN);
+  const last = Math.min(records.length, Math.ceil((scrollTop + viewportHeight) / ROW_HEIGHT) + OVERSCAN);
+
+  // Paused while an error is shown; the Retry button resumes loading.
+  useEffect(() => {
+    if (nextCursor && !loading && !error && last >= records.length - LOAD_AHEAD) {
+      loadPage(nextCursor);
+    }
+  }, [last, records.length, nextCursor, loading, error, loadPage]);
+
+  const showJson = useCallback(async (r) => {
+    try {
+      const jsonUrl = staticUrl(r.file_path.replace(/\.\w+$/, '.json'));
+      const res = await fetch(apiBase + jsonUrl);
+      if (!res.ok) throw new Error('Failed to fetch sidecar');
+      const jd = await res.json();
+      setModalData(jd);
+      setModalOpen(true);
+    } catch (e) {
+      alert(e.message);
+    }
+  }, []);
 
   return (
     <div className="mt-6">
@@ -57,10 +237,7 @@ export default function MetadataTable() {
           <select
             className="ml-2 border p-1"
             value={sourceType}
-            onChange={(e) => {
-              setOffset(0);
-              setSourceType(e.target.value);
-            }}
+            onChange={(e) => setSourceType(e.target.value)}
           >
             {sourceOptions.map((o) => (
               <option key={o.value} value={o.value}>
@@ -70,44 +247,45 @@ export default function MetadataTable() {
           </select>
         </label>
 
-        <label>
-          Limit:
-          <select
-            className="ml-2 border p-1"
-            value={limit}
-            onChange={(e) => {
-              setOffset(0);
-              setLimit(parseInt(e.target.value, 10));
-            }}
-          >
-            {limits.map((l) => (
-              <option key={l} value={l}>
-                {l}
-              </option>
-            ))}
-          </select>
-        </label>
-
         <button
           className="border px-3 py-1 rounded bg-blue-500 text-white"
-          onClick={fetchData}
-          disabled={loading}
+          onClick={refresh}
+          disabled={loading && records.length === 0}
         >
-          {loading ? 'Loading…' : 'Refresh'}
+          {loading && records.length === 0 ? 'Loading…' : 'Refresh'}
         </button>
 
+        <span className="text-gray-500 text-sm">
+          {records.length} loaded{nextCursor ? '' : records.length ? ' (all)' : ''}
+          {loading && records.length > 0 ? ' · loading more…' : ''}
+        </span>
+
         {error && (
-          <div className="text-red-500 ml-4">Error: {error}</div>
+          <div className="text-red-500 ml-4">
+            Error: {error}
+            <button
+              className="ml-2 border px-2 rounded"
+              onClick={() => (records.length ? loadPage(nextCursor) : refresh())}
+            >
+              Retry
+            </button>
+          </div>
         )}
       </div>
 
       {records.length === 0 && !loading ? (
         <div>No records yet.</div>
       ) : (
-        <div className="overflow-x-auto">
-          <table className="min-w-full text-sm border">
-            <thead className="bg-gray-100">
+        <div
+          ref={setScroller}
+          onScroll={onScroll}
+          className="overflow-auto border"
+          style={{ height: '70vh' }}
+        >
+          <table className="min-w-full text-sm">
+            <thead className="bg-gray-100 sticky top-0 z-10">
               <tr>
+                <th className="p-2 border">Preview</th>
                 <th className="p-2 border">Ingest Date</th>
                 <th className="p-2 border">Source</th>
                 <th className="p-2 border">Author</th>
@@ -120,77 +298,21 @@ export default function MetadataTable() {
               </tr>
             </thead>
             <tbody>
-              {records.map((r) => (
-                <tr key={r.id} className="hover:bg-gray-50">
-                  <td className="p-2 border whitespace-nowrap">{r.ingest_date}</td>
-                  <td className="p-2 border">{r.source_type}</td>
-                  <td className="p-2 border">{r.author}</td>
-                  <td className="p-2 border text-blue-600 underline">
-                    <a href={r.original_url} target="_blank" rel="noreferrer">
-                      link
-                    </a>
-                  </td>
-                  <td className="p-2 border" title={r.file_path}>
-                    {truncateMiddle(r.file_path)}
-                  </td>
-                  <td className="p-2 border">{r.publish_date || '-'}</td>
-                  <td className="p-2 border text-right">{r.length_seconds ?? '-'}</td>
-                  <td className="p-2 border">{r.notes || ''}</td>
-                  <td className="p-2 border text-center space-x-2">
-                    {/* Download button */}
-                    <a
-                      href={r.file_path.replace(/.*data[\\/]/, '/static/').replace(/\\/g, '/')}
-                      target="_blank"
-                      rel="noreferrer"
-                      title="Download file"
-                      className="text-green-600 hover:underline"
-                    >
-                      ⬇
-                    </a>
-                    {/* View JSON */}
-                    <button
-                      title="View JSON metadata"
-                      onClick={async () => {
-                        try {
-                          const jsonUrl = r.file_path.replace(/\.\w+$/, '.json').replace(/.*data[\\/]/, '/static/').replace(/\\/g, '/');
-                          const base = process.env.REACT_APP_API_BASE || 'http://localhost:8000';
-                          const res = await fetch(base + jsonUrl);
-                          if (!res.ok) throw new Error('Failed to fetch sidecar');
-                          const jd = await res.json();
-                          setModalData(jd);
-                          setModalOpen(true);
-                        } catch (e) {
-                          alert(e.message);
-                        }
-                      }}
-                    >
-                      ℹ
-                    </button>
-                  </td>
-                </tr>
+              {/* spacer rows stand in for everything outside the rendered window */}
+              <tr style={{ height: first * ROW_HEIGHT }}>
+                <td colSpan={COLUMN_COUNT} className="p-0" />
+              </tr>
+              {records.slice(first, last).map((r) => (
+                <Row key={r.id} r={r} onShowJson={showJson} />
               ))}
+              <tr style={{ height: (records.length - last) * ROW_HEIGHT }}>
+                <td colSpan={COLUMN_COUNT} className="p-0" />
+              </tr>
             </tbody>
           </table>
         </div>
-        <MetadataModal isOpen={modalOpen} onClose={() => setModalOpen(false)} jsonData={modalData} />
       )}
-
-      <div className="flex justify-between mt-4">
-        <button
-          onClick={prevPage}
-          disabled={offset === 0}
-          className="border px-3 py-1 rounded disabled:opacity-50"
-        >
-          Prev
-        </button>
-        <button
-          onClick={nextPage}
-          disabled={records.length < limit}
-          className="border px-3 py-1 rounded disabled:opacity-50"
-        >
-          Next
-        </button>
-      </div>
+      <MetadataModal isOpen={modalOpen} onClose={() => setModalOpen(false)} jsonData={modalData} />
     </div>
   );
 }
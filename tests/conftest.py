@@ -0,0 +1,24 @@
+import pytest
+
+from backend.ingestion.metadata.metadata_utils import build_metadata, insert_metadata_to_db, write_sidecar
+
+
+@pytest.fixture
+def seed_catalog():
+    """Build one metadata record, optionally pinning its ingest_date, and store it.
+
+    The record is inserted into *db_path* when given and written as a sidecar
+    next to *file_path* when *sidecar* is true; the metadata dict is returned.
+    """
+    def seed(original_url, file_path, *, db_path=None, ingest_date=None, sidecar=False,
+             source_type="instagram", **fields):
+        md = build_metadata(source_type=source_type, original_url=original_url, file_path=str(file_path), **fields)
+        if ingest_date is not None:
+            md["ingest_date"] = ingest_date
+        if sidecar:
+            write_sidecar(md)
+        if db_path is not None:
+            insert_metadata_to_db(md, db_path=str(db_path))
+        return md
+
+    return seed
@@ -0,0 +1,66 @@
+import sqlite3
+from datetime import datetime, timedelta
+
+from backend.config import POLL_MAX_MINUTES, POLL_MIN_MINUTES, SCRAPE_INTERVAL
+from backend.ingestion.scheduler.adaptive import (
+    due_accounts,
+    force_poll,
+    init_schedule_tables,
+    next_interval,
+    posting_cadence,
+    record_run,
+)
+
+
+def _posts(start, hours, n):
+    return [
+        {"id": f"p{i}", "date_posted": (start - timedelta(hours=hours * i)).strftime("%Y%m%dT%H%M%S")}
+        for i in range(n)
+    ]
+
+
+def test_interval_backs_off_when_idle_and_respects_bounds():
+    assert next_interval(60, 0, None, None) == 90
+    assert next_interval(60, 3, None, None) == 30
+    assert next_interval(1, 1, None, None) == POLL_MIN_MINUTES
+    assert next_interval(POLL_MAX_MINUTES, 0, None, None) == POLL_MAX_MINUTES
+    # a quiet account that usually posts every 6h is still polled at least every 2h ...
+    assert next_interval(400, 0, 360, 60) == 120
+    # ... unless it has been silent for much longer than its cadence
+    assert next_interval(400, 0, 360, 5000) == min(600, POLL_MAX_MINUTES)
+
+
+def test_record_run_learns_cadence_and_schedules_next_poll():
+    conn = sqlite3.connect(":memory:")
+    init_schedule_tables(conn)
+    now = datetime(2025, 9, 1, 12, 0, 0)
+    assert due_accounts(conn, ["alice"], now) == ["alice"]
+
+    interval = record_run(conn, "alice", _posts(now - timedelta(hours=1), 6, 5), 5, now)
+
+    assert posting_cadence(conn, "alice") == 360
+    assert interval == max(SCRAPE_INTERVAL * 0.5, POLL_MIN_MINUTES)
+    assert due_accounts(conn, ["alice"], now + timedelta(minutes=interval - 1)) == []
+    assert due_accounts(conn, ["alice"], now + timedelta(minutes=interval)) == ["alice"]
+    assert conn.execute("SELECT new_posts FROM account_poll_history").fetchall() == [(5,)]
+
+    force_poll(conn, "alice")
+    assert due_accounts(conn, ["alice"]) == ["alice"]
+
+
+def test_force_endpoint_only_accepts_scheduled_accounts(tmp_path, monkeypatch):
+    from fastapi.testclient import TestClient
+
+    from backend.api import routes
+    from backend.ingestion.scheduler import scheduler_app
+    from backend.main import app
+
+    monkeypatch.setattr(scheduler_app, "ACCOUNTS", ["known"])
+    monkeypatch.setattr(routes, "get_connection", lambda: sqlite3.connect(tmp_path / "posts.db"))
+    client = TestClient(app)
+
+    assert client.post("/api/schedule/stranger/force").status_code == 404
+    assert client.post("/api/schedule/known/force").json() == {"username": "known", "status": "due"}
+    conn = sqlite3.connect(tmp_path / "posts.db")
+    assert [r[0] for r in conn.execute("SELECT username FROM account_poll_state")] == ["known"]
+    conn.close()
@@ -0,0 +1,79 @@
+import time
+
+from fastapi.testclient import TestClient
+
+from backend.api.cache import ResponseCache
+from backend.db.generation import bump_catalog_generation
+from backend.main import app
+
+client = TestClient(app)
+
+
+def test_etag_revalidation_follows_catalog_generation():
+    r1 = client.get("/api/metadata?limit=5")
+    assert r1.status_code == 200
+    etag = r1.headers["etag"]
+
+    r2 = client.get("/api/metadata?limit=5", headers={"If-None-Match": etag})
+    assert r2.status_code == 304
+    assert r2.content == b""
+
+    assert client.get("/api/metadata?limit=10").headers["etag"] != etag
+
+    bump_catalog_generation()
+    r3 = client.get("/api/metadata?limit=5", headers={"If-None-Match": etag})
+    assert r3.status_code == 200
+    assert r3.headers["etag"] != etag
+
+
+def test_response_cache_lru_and_ttl():
+    cache = ResponseCache(maxsize=2, ttl=60)
+    cache.set("a", b"1")
+    cache.set("b", b"2")
+    assert cache.get("a") == b"1"
+    cache.set("c", b"3")  # evicts least recently used "b"
+    assert cache.get("b") is None
+    assert cache.get("a") == b"1" and cache.get("c") == b"3"
+
+    short = ResponseCache(maxsize=2, ttl=0.01)
+    short.set("a", b"1")
+    time.sleep(0.02)
+    assert short.get("a") is None
+
+
+def test_metadata_compact_projection_and_bad_input():
+    r = client.get("/api/metadata?compact=true&fields=id,ingest_date,thumbnail_url&limit=3")
+    assert r.status_code == 200
+    body = r.json()
+    assert body["fields"] == ["id", "ingest_date", "thumbnail_url"]
+    assert all(len(row) == 3 for row in body["rows"])
+    assert "next_cursor" in body
+
+    assert client.get("/api/metadata?fields=id,nope").status_code == 400
+    assert client.get("/api/metadata?cursor=%%%").status_code == 400
+
+
+def test_out_of_process_write_invalidates_etag(tmp_path, monkeypatch):
+    import sqlite3
+
+    from backend.db import generation
+    from backend.db.db import ensure_catalog_table
+
+    db_path = tmp_path / "content.db"
+    conn = sqlite3.connect(db_path)
+    ensure_catalog_table(conn)
+    conn.close()
+    monkeypatch.setattr(generation, "CONTENT_DB_PATH", db_path)
+
+    etag = client.get("/api/metadata?limit=7").headers["etag"]
+    assert client.get("/api/metadata?limit=7", headers={"If-None-Match": etag}).status_code == 304
+
+    # another process (reindex, migrate_layout, …) writes the catalog directly
+    other = sqlite3.connect(db_path)
+    with other:
+        other.execute(
+            "INSERT INTO ingested_content (id, source_type, original_url, file_path, ingest_date) "
+            "VALUES ('x', 'instagram', 'https://x/p/x/', '/x.mp4', '2025-09-01T00:00:00Z')"
+        )
+    other.close()
+    assert client.get("/api/metadata?limit=7", headers={"If-None-Match": etag}).status_code == 200
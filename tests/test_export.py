@@ -0,0 +1,58 @@
+import gzip
+import json
+
+from backend.db.export import stream_catalog
+
+
+def _seed(seed_catalog, db_path, n=3):
+    for i in range(n):
+        seed_catalog(f"https://www.instagram.com/p/post{i}/", f"/data/instagram/post{i}.mp4",
+                     db_path=db_path, ingest_date=f"2025-09-0{i + 1}T00:00:00Z", author="tester")
+
+
+def test_export_ndjson_ordered(tmp_path, seed_catalog):
+    db_path = tmp_path / "content.db"
+    _seed(seed_catalog, db_path)
+    lines = b"".join(stream_catalog(db_path=db_path)).decode().splitlines()
+    rows = [json.loads(line) for line in lines]
+    assert [r["ingest_date"] for r in rows] == sorted(r["ingest_date"] for r in rows)
+    assert len(rows) == 3
+
+
+def test_export_since_and_gzip(tmp_path, seed_catalog):
+    db_path = tmp_path / "content.db"
+    _seed(seed_catalog, db_path)
+    payload = b"".join(stream_catalog(since="2025-09-01T00:00:00Z", gzip=True, db_path=db_path))
+    rows = [json.loads(line) for line in gzip.decompress(payload).decode().splitlines()]
+    assert [r["original_url"] for r in rows] == [
+        "https://www.instagram.com/p/post1/",
+        "https://www.instagram.com/p/post2/",
+    ]
+
+
+def test_export_missing_db(tmp_path):
+    assert b"".join(stream_catalog(db_path=tmp_path / "missing.db")) == b""
+
+
+def test_export_resumes_within_same_second(tmp_path, seed_catalog):
+    db_path = tmp_path / "content.db"
+    for i in range(4):
+        seed_catalog(f"https://www.instagram.com/p/same{i}/", f"/data/instagram/same{i}.mp4",
+                     db_path=db_path, ingest_date="2025-09-01T00:00:00Z")
+    rows = [json.loads(line) for line in b"".join(stream_catalog(db_path=db_path)).decode().splitlines()]
+    assert [r["id"] for r in rows] == sorted(r["id"] for r in rows)
+
+    last = rows[1]
+    resumed = b"".join(stream_catalog(since=last["ingest_date"], after_id=last["id"], db_path=db_path))
+    assert [json.loads(line)["id"] for line in resumed.decode().splitlines()] == [r["id"] for r in rows[2:]]
+
+
+def test_export_after_id_requires_since(tmp_path):
+    import pytest
+    from fastapi.testclient import TestClient
+
+    from backend.main import app
+
+    with pytest.raises(ValueError):
+        stream_catalog(after_id="x", db_path=tmp_path / "content.db")
+    assert TestClient(app).get("/api/metadata/export?after_id=x").status_code == 400
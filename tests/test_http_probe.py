@@ -0,0 +1,110 @@
+"""HTTP probe tests against a local stand-in for instagram.com post pages."""
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from backend.ingestion.instagram_ingestion import post_ingest
+from backend.ingestion.instagram_ingestion.http_probe import probe_post
+
+PAGES = {
+    "/p/VIDEO1/": (
+        '<html><head><meta property="og:type" content="video.other">'
+        '<meta property="og:video" content="https://cdn.example/v1.mp4">'
+        '<meta property="og:video:upload_date" content="1726300800">'
+        "</head><body>" + "x" * 4_000_000 + "</body></html>"
+    ),
+    "/reel/VIDEO2/": (
+        '<html><head><meta property="og:type" content="video.other"></head>'
+        '<body><video src="https://cdn.example/v2.mp4"></video></body></html>'
+    ),
+    "/p/IMAGE1/": (
+        '<html><head><meta property="og:type" content="article">'
+        '<meta property="og:url" content="https://www.instagram.com/p/IMAGE1/">'
+        '<meta property="og:image" content="https://cdn.example/i.jpg"></head><body></body></html>'
+    ),
+    # consent/landing page: has an og:image (the logo) but is not the post
+    "/p/SITE1/": (
+        '<html><head><meta property="og:type" content="website">'
+        '<meta property="og:url" content="https://www.instagram.com/">'
+        '<meta property="og:image" content="https://cdn.example/logo.png"></head><body></body></html>'
+    ),
+    # carousel: several images, any video slide is not advertised in og:video
+    "/p/CAROUSEL1/": (
+        '<html><head><meta property="og:type" content="article">'
+        '<meta property="og:url" content="https://www.instagram.com/p/CAROUSEL1/">'
+        '<meta property="og:image" content="https://cdn.example/c1.jpg">'
+        '<meta property="og:image" content="https://cdn.example/c2.jpg"></head><body></body></html>'
+    ),
+    "/p/WALL1/": "<html><head><title>Login • Instagram</title></head><body></body></html>",
+    "/p/CHARSET1/": '<html><head><meta property="og:type" content="video.other"></head></html>',
+}
+# pages served with a Content-Type charset Python has no codec for
+CHARSETS = {"/p/CHARSET1/": "x-no-such-charset"}
+
+
+class _StandIn(BaseHTTPRequestHandler):
+    def do_GET(self):
+        page = PAGES.get(self.path)
+        if page is None:
+            self.send_error(404)
+            return
+        body = page.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", f"text/html; charset={CHARSETS.get(self.path, 'utf-8')}")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        try:
+            for i in range(0, len(body), 65536):
+                self.wfile.write(body[i:i + 65536])
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture(scope="module")
+def standin():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StandIn)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+
+
+def test_probe_reads_og_video_from_head(standin):
+    result = probe_post(f"{standin}/p/VIDEO1/")
+    assert (result.media_type, result.video_src, result.upload_ts) == (
+        "video", "https://cdn.example/v1.mp4", 1726300800)
+
+
+def test_probe_video_tag_image_and_fallback(standin):
+    assert probe_post(f"{standin}/reel/VIDEO2/").video_src == "https://cdn.example/v2.mp4"
+    assert probe_post(f"{standin}/p/IMAGE1/").media_type == "image"
+    assert probe_post(f"{standin}/p/WALL1/") is None
+    assert probe_post(f"{standin}/p/SITE1/") is None
+    assert probe_post(f"{standin}/p/CAROUSEL1/") is None
+    assert probe_post(f"{standin}/p/MISSING/") is None
+    assert probe_post(f"{standin}/p/CHARSET1/") is None
+
+
+def test_batch_uses_probe_and_skips_browser(standin, monkeypatch):
+    downloads = []
+
+    def fake_download(username, post_id, url, video_src, date_str, *, skip_ffprobe=False):
+        downloads.append((post_id, video_src, date_str))
+        return "downloaded", None
+
+    def no_browser():
+        raise AssertionError("browser should not be launched")
+
+    monkeypatch.setattr(post_ingest, "INSTAGRAM_BASE", standin)
+    monkeypatch.setattr(post_ingest, "find_ingested_urls", lambda urls: {})
+    monkeypatch.setattr(post_ingest, "download_post_video", fake_download)
+    monkeypatch.setattr(post_ingest, "async_playwright", no_browser)
+
+    results = asyncio.run(post_ingest.ingest_posts(["VIDEO1", "IMAGE1"]))
+    assert [r["status"] for r in results] == ["downloaded", "not_video"]
+    assert downloads == [("VIDEO1", "https://cdn.example/v1.mp4", "20240914T080000")]
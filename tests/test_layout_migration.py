@@ -0,0 +1,62 @@
+import json
+
+from backend.db.db import find_ingested_file
+from backend.ingestion.instagram_ingestion.layout import media_path_for
+from backend.ingestion.instagram_ingestion.migrate_layout import migrate
+from backend.ingestion.metadata.metadata_utils import build_metadata, insert_metadata_to_db, write_sidecar
+
+
+def test_media_path_is_sharded(tmp_path):
+    path = media_path_for("some.user", "C_abc1", "20250914T101500", root=tmp_path)
+    assert path == tmp_path / "some.user" / "2025" / "09" / "C_abc1_20250914T101500.mp4"
+
+
+def test_migrate_moves_files_and_rewrites_catalog(tmp_path):
+    root = tmp_path / "instagram"
+    root.mkdir()
+    db_path = tmp_path / "content.db"
+    video = root / "C_abc1_20250914T101500.mp4"
+    video.write_bytes(b"\x00" * 16)
+    (root / "unrelated.txt").write_text("keep me")
+    md = build_metadata(
+        source_type="instagram",
+        original_url="https://www.instagram.com/p/C_abc1/",
+        file_path=str(video.resolve()),
+        author="some.user",
+    )
+    write_sidecar(md)
+    insert_metadata_to_db(md, db_path=str(db_path))
+
+    assert migrate(root, db_path) == 2
+
+    new_video = root / "some.user" / "2025" / "09" / video.name
+    assert new_video.exists() and not video.exists()
+    assert (root / "unrelated.txt").exists()
+    sidecar = json.loads(new_video.with_suffix(".json").read_text())
+    assert sidecar["file_path"] == str(new_video.resolve())
+    assert find_ingested_file("https://www.instagram.com/p/C_abc1/", db_path) == str(new_video.resolve())
+
+
+def test_rerun_restores_paths_after_interrupted_migration(tmp_path):
+    root = tmp_path / "instagram"
+    root.mkdir()
+    db_path = tmp_path / "content.db"
+    video = root / "C_abc1_20250914T101500.mp4"
+    video.write_bytes(b"\x00" * 16)
+    md = build_metadata(
+        source_type="instagram",
+        original_url="https://www.instagram.com/p/C_abc1/",
+        file_path=str(video.resolve()),
+        author="some.user",
+    )
+    write_sidecar(md)
+    insert_metadata_to_db(md, db_path=str(db_path))
+
+    # simulate a crash after the files were moved but before the catalog update
+    new_dir = root / "some.user" / "2025" / "09"
+    new_dir.mkdir(parents=True)
+    video.replace(new_dir / video.name)
+    video.with_suffix(".json").replace(new_dir / f"{video.stem}.json")
+
+    assert migrate(root, db_path) == 0
+    assert find_ingested_file("https://www.instagram.com/p/C_abc1/", db_path) == str((new_dir / video.name).resolve())
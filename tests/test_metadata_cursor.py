@@ -0,0 +1,23 @@
+from backend.db.db import fetch_metadata_page
+
+
+def test_keyset_pages_cover_catalog_once_in_order(tmp_path, seed_catalog):
+    db_path = tmp_path / "content.db"
+    for i in range(11):
+        seed_catalog(f"https://example.com/{i}", f"/nowhere/{i}.mp4", db_path=db_path,
+                     source_type="instagram" if i % 2 else "youtube",
+                     ingest_date=f"2025-09-{1 + i // 3:02d}T00:00:00Z")  # ties on ingest_date
+    by_offset = fetch_metadata_page(100, db_path=db_path)["rows"]
+
+    seen, cursor = [], None
+    while True:
+        page = fetch_metadata_page(4, cursor=cursor, fields=["id", "ingest_date"], db_path=db_path)
+        assert all(set(r) == {"id", "ingest_date"} for r in page["rows"])
+        seen.extend(r["id"] for r in page["rows"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert seen == [r["id"] for r in by_offset]
+
+    filtered = fetch_metadata_page(100, source_type="instagram", fields=["source_type"], db_path=db_path)
+    assert len(filtered["rows"]) == 5 and filtered["next_cursor"] is None
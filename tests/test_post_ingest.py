@@ -0,0 +1,76 @@
+import asyncio
+import functools
+
+from backend.db.db import find_ingested_urls
+from backend.ingestion.instagram_ingestion import post_ingest
+from backend.ingestion.instagram_ingestion.post_ingest import ingest_posts, normalize_item
+from backend.ingestion.metadata.metadata_utils import build_metadata, insert_metadata_to_db
+
+
+def test_normalize_item():
+    assert normalize_item("https://www.instagram.com/reel/C_abc12/?igsh=x") == (
+        "C_abc12", "https://www.instagram.com/reel/C_abc12/")
+    assert normalize_item("ABCDEF") == ("ABCDEF", "https://www.instagram.com/p/ABCDEF/")
+    assert normalize_item("https://www.instagram.com/someuser/") is None
+    assert normalize_item("not a code") is None
+
+
+def test_batch_dedupes_against_catalog_without_browser(tmp_path, monkeypatch):
+    db_path = tmp_path / "content.db"
+    md = build_metadata(
+        source_type="instagram",
+        original_url="https://www.instagram.com/reel/ABCDEF/",
+        file_path="/data/instagram/u/2025/09/ABCDEF_1.mp4",
+        author="u",
+    )
+    insert_metadata_to_db(md, db_path=str(db_path))
+    monkeypatch.setattr(post_ingest, "find_ingested_urls", functools.partial(find_ingested_urls, db_path=db_path))
+
+    results = asyncio.run(ingest_posts(["ABCDEF", "https://www.instagram.com/p/ABCDEF/", "??"]))
+    assert [r["status"] for r in results] == ["exists", "duplicate", "invalid"]
+    assert results[0]["file_path"] == "/data/instagram/u/2025/09/ABCDEF_1.mp4"
+
+
+def test_download_dedupes_by_shortcode_across_url_flavours(tmp_path, monkeypatch):
+    from backend.ingestion.instagram_ingestion import instagram_scraper
+
+    db_path = tmp_path / "content.db"
+    md = build_metadata(
+        source_type="instagram",
+        original_url="https://www.instagram.com/p/XYZ123/",
+        file_path="/data/instagram/u/2025/09/XYZ123_1.mp4",
+    )
+    insert_metadata_to_db(md, db_path=str(db_path))
+    monkeypatch.setattr(instagram_scraper, "find_ingested_urls",
+                        functools.partial(find_ingested_urls, db_path=db_path))
+
+    status, path = instagram_scraper.download_post_video(
+        "u", "XYZ123", "https://www.instagram.com/u/reel/XYZ123/", "https://cdn.invalid/v.mp4")
+    assert (status, str(path)) == ("exists", "/data/instagram/u/2025/09/XYZ123_1.mp4")
+
+
+def test_downloads_are_bounded_by_concurrency(tmp_path, monkeypatch):
+    import threading
+    import time
+
+    from backend.ingestion.instagram_ingestion.http_probe import ProbeResult
+
+    lock, state = threading.Lock(), {"active": 0, "peak": 0}
+
+    def fake_download(username, post_id, url, video_src, ts, skip_ffprobe=False):
+        with lock:
+            state["active"] += 1
+            state["peak"] = max(state["peak"], state["active"])
+        time.sleep(0.05)
+        with lock:
+            state["active"] -= 1
+        return "downloaded", tmp_path / f"{post_id}.mp4"
+
+    monkeypatch.setattr(post_ingest, "HTTP_PROBE", True)
+    monkeypatch.setattr(post_ingest, "find_ingested_urls", lambda urls: {})
+    monkeypatch.setattr(post_ingest, "probe_post", lambda url: ProbeResult("video", "https://cdn.invalid/v.mp4"))
+    monkeypatch.setattr(post_ingest, "download_post_video", fake_download)
+
+    results = asyncio.run(ingest_posts(["AAAAAA", "BBBBBB", "CCCCCC", "DDDDDD"], concurrency=2))
+    assert [r["status"] for r in results] == ["downloaded"] * 4
+    assert state["peak"] <= 2
@@ -0,0 +1,99 @@
+import os
+import threading
+
+import pytest
+
+from backend.media import previews
+
+
+@pytest.fixture
+def preview_dir(tmp_path, monkeypatch):
+    target = tmp_path / "data" / "previews"
+    monkeypatch.setattr(previews, "PREVIEW_DIR", target)
+    monkeypatch.setattr(previews, "bump_catalog_generation", lambda: None)
+    return target
+
+
+def _video(tmp_path, name="clip.mp4"):
+    video = tmp_path / "data" / "instagram" / name
+    video.parent.mkdir(parents=True, exist_ok=True)
+    video.write_bytes(b"\x00" * 16)
+    return video
+
+
+def test_cache_paths_key_on_path_and_mtime(tmp_path, preview_dir):
+    video = _video(tmp_path)
+    other = _video(tmp_path, "other.mp4")
+    poster, preview = previews.cache_paths(video)
+    assert poster.suffix == ".jpg" and preview.suffix == ".mp4"
+    assert poster.parent.parent == preview_dir and poster.parent.name == poster.stem[:2]
+    assert previews.cache_paths(other)[0] != poster
+
+    st = video.stat()
+    os.utime(video, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    assert previews.cache_paths(video)[0] != poster
+    assert previews.cache_paths(tmp_path / "missing.mp4") is None
+
+
+def test_preview_urls_map_under_static(tmp_path, preview_dir):
+    video = _video(tmp_path)
+    assert previews.preview_urls(video) == {"thumbnail_url": None, "preview_url": None}
+    poster, preview = previews.cache_paths(video)
+    poster.parent.mkdir(parents=True)
+    poster.write_bytes(b"jpg")
+    preview.write_bytes(b"mp4")
+
+    urls = previews.preview_urls(video)
+    assert urls["thumbnail_url"] == f"/static/previews/{poster.parent.name}/{poster.name}"
+    assert urls["preview_url"] == f"/static/previews/{preview.parent.name}/{preview.name}"
+    assert previews.preview_urls(None) == {"thumbnail_url": None, "preview_url": None}
+
+
+def test_submit_dedupes_in_flight_and_skips_cached(tmp_path, preview_dir, monkeypatch):
+    release = threading.Event()
+    calls = []
+
+    def fake_ffmpeg(args, dest):
+        calls.append(dest)
+        release.wait(5)
+        dest.write_bytes(b"x")
+        return True
+
+    monkeypatch.setattr(previews, "_run_ffmpeg", fake_ffmpeg)
+    service = previews.PreviewService(max_workers=2)
+    try:
+        video = _video(tmp_path)
+        first = service.submit(video)
+        assert first is not None
+        assert service.submit(video) is first
+        release.set()
+        first.result(timeout=5)
+        assert len(calls) == 2  # one poster, one preview
+        assert service.submit(video) is None
+    finally:
+        service.shutdown()
+
+
+def test_stored_preview_key_survives_eviction(tmp_path, preview_dir):
+    import sqlite3
+
+    from backend.ingestion.metadata.metadata_utils import build_metadata, insert_metadata_to_db
+
+    db_path = tmp_path / "content.db"
+    video = _video(tmp_path)
+    insert_metadata_to_db(
+        build_metadata(source_type="instagram", original_url="https://x/p/a/", file_path=str(video.resolve())),
+        db_path=str(db_path),
+    )
+    poster, preview = previews.cache_paths(video)
+    poster.parent.mkdir(parents=True)
+    poster.write_bytes(b"jpg")
+    preview.write_bytes(b"mp4")
+    previews._record_preview_key(video, poster.stem, db_path)
+
+    video.unlink()  # evicted by retention
+    conn = sqlite3.connect(db_path)
+    (key,) = conn.execute("SELECT preview_key FROM ingested_content").fetchone()
+    conn.close()
+    assert previews.preview_urls(video)["thumbnail_url"] is None
+    assert previews.preview_urls(video, key)["thumbnail_url"].endswith(poster.name)
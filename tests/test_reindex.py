@@ -0,0 +1,54 @@
+import sqlite3
+
+import pytest
+
+from backend.db.reindex import reindex
+from backend.db.stats import fetch_stats
+
+
+@pytest.fixture
+def make_sidecar(seed_catalog):
+    def sidecar(data_dir, name, size, recorded_size=None, with_media=True):
+        video = data_dir / "instagram" / "alice" / "2025" / "09" / f"{name}.mp4"
+        video.parent.mkdir(parents=True, exist_ok=True)
+        if with_media:
+            video.write_bytes(b"\x00" * size)
+        return seed_catalog(f"https://www.instagram.com/p/{name}/", video, sidecar=True, author="alice",
+                            file_size=size if recorded_size is None else recorded_size)
+    return sidecar
+
+
+def test_reindex_rebuilds_catalog_and_reports_orphans(tmp_path, make_sidecar):
+    data_dir, db_path, posts_db = tmp_path / "data", tmp_path / "content.db", tmp_path / "posts.db"
+    make_sidecar(data_dir, "ok", 100)
+    make_sidecar(data_dir, "truncated", 50, recorded_size=80)
+    gone = make_sidecar(data_dir, "gone", 10, with_media=False)
+    stray = data_dir / "instagram" / "alice" / "stray.mp4"
+    stray.write_bytes(b"\x00")
+    (data_dir / "previews" / "ab").mkdir(parents=True)
+    (data_dir / "previews" / "ab" / "x.mp4").write_bytes(b"\x00")
+    conn = sqlite3.connect(posts_db)
+    conn.execute("CREATE TABLE posts (id TEXT PRIMARY KEY, url TEXT, date_posted TEXT, media_type TEXT)")
+    conn.executemany("INSERT INTO posts VALUES (?, ?, '', 'video')",
+                     [("ok", "u1"), ("never", "u2")])
+    conn.commit()
+    conn.close()
+
+    report = reindex(data_dir, db_path, posts_db=posts_db, workers=1)
+
+    assert report["inserted"] == 3
+    assert [p.endswith("gone.json") for p in report["missing_media"]] == [True]
+    assert [p.endswith("truncated.mp4") for p in report["size_mismatch"]] == [True]
+    assert report["media_without_sidecar"] == [str(stray)]
+    assert report["posts_without_catalog"] == ["never"]
+    assert report["catalog_without_posts"] == ["gone", "truncated"]
+    conn = sqlite3.connect(db_path)
+    rows = dict(conn.execute("SELECT id, evicted FROM ingested_content"))
+    conn.close()
+    assert rows[gone["source_id"]] == 1 and sum(rows.values()) == 1
+    assert fetch_stats(db_path=db_path)["totals"]["items"] == 3
+
+    # a second merge run is idempotent; a fresh rebuild swaps in a new file
+    assert reindex(data_dir, db_path, posts_db=posts_db, workers=1)["inserted"] == 0
+    assert reindex(data_dir, db_path, posts_db=posts_db, workers=1, fresh=True)["inserted"] == 3
+    assert (tmp_path / "content.db.bak").exists()
@@ -0,0 +1,63 @@
+import sqlite3
+
+import pytest
+
+from backend.media.retention import run_retention_sweep, set_pinned
+
+
+@pytest.fixture
+def add(seed_catalog):
+    def add_video(data_dir, db_path, name, size, ingest_date):
+        video = data_dir / "instagram" / f"{name}.mp4"
+        video.parent.mkdir(parents=True, exist_ok=True)
+        video.write_bytes(b"\x00" * size)
+        md = seed_catalog(f"https://www.instagram.com/p/{name}/", video.resolve(), db_path=db_path,
+                          ingest_date=ingest_date, sidecar=True, file_size=size)
+        return md["source_id"], video
+    return add_video
+
+
+def test_largest_policy_respects_pins_and_keeps_sidecars(tmp_path, add):
+    data_dir, db_path = tmp_path / "data", tmp_path / "content.db"
+    big_id, big = add(data_dir, db_path, "big", 6000, "2025-09-01T00:00:00Z")
+    _mid_id, mid = add(data_dir, db_path, "mid", 3000, "2025-09-02T00:00:00Z")
+    _small_id, small = add(data_dir, db_path, "small", 1000, "2025-09-03T00:00:00Z")
+    assert set_pinned(big_id, True, db_path)
+
+    summary = run_retention_sweep(max_bytes=9500, policy="largest", db_path=db_path, data_dir=data_dir,
+                                  log_dir=tmp_path / "logs")
+
+    assert summary["evicted"] == 1
+    assert big.exists() and not mid.exists() and small.exists()
+    assert mid.with_suffix(".json").exists()
+    conn = sqlite3.connect(db_path)
+    evicted = dict(conn.execute("SELECT original_url, evicted FROM ingested_content"))
+    conn.close()
+    assert evicted["https://www.instagram.com/p/mid/"] == 1
+    assert evicted["https://www.instagram.com/p/big/"] == 0
+
+
+def test_lru_policy_evicts_oldest_first_and_noop_under_quota(tmp_path, add):
+    data_dir, db_path = tmp_path / "data", tmp_path / "content.db"
+    _a, old = add(data_dir, db_path, "old", 3000, "2025-09-01T00:00:00Z")
+    _b, new = add(data_dir, db_path, "new", 3000, "2025-09-02T00:00:00Z")
+
+    assert run_retention_sweep(max_bytes=100000, policy="lru", db_path=db_path, data_dir=data_dir,
+                               log_dir=tmp_path / "logs")["evicted"] == 0
+    run_retention_sweep(max_bytes=5000, policy="lru", db_path=db_path, data_dir=data_dir, log_dir=tmp_path / "logs")
+    assert not old.exists() and new.exists()
+
+
+def test_sweep_prunes_only_its_own_log_dir(tmp_path):
+    import os
+
+    log_dir = tmp_path / "logs"
+    (log_dir / "traces").mkdir(parents=True)
+    old, fresh = log_dir / "traces" / "old.json", log_dir / "fresh.json"
+    old.write_text("{}")
+    fresh.write_text("{}")
+    os.utime(old, (0, 0))
+
+    summary = run_retention_sweep(max_bytes=0, db_path=tmp_path / "missing.db", data_dir=tmp_path, log_dir=log_dir)
+    assert summary["logs_pruned"] == 1
+    assert not old.exists() and fresh.exists()
@@ -0,0 +1,55 @@
+import sqlite3
+
+import pytest
+
+from backend.db.stats import fetch_stats, main as stats_main, rebuild_stats
+
+
+@pytest.fixture
+def insert(seed_catalog):
+    def insert(db_path, url, author, seconds, ingest_date):
+        seed_catalog(url, url.rsplit("/", 2)[-2] + ".mp4", db_path=db_path, ingest_date=ingest_date,
+                     author=author, length_seconds=seconds)
+    return insert
+
+
+def test_rollups_follow_inserts_and_deletes(tmp_path, insert):
+    db_path = tmp_path / "content.db"
+    insert(db_path, "https://www.instagram.com/p/a/", "alice", 60, "2025-09-01T10:00:00Z")
+    insert(db_path, "https://www.instagram.com/p/b/", "alice", 30, "2025-09-01T11:00:00Z")
+    insert(db_path, "https://www.instagram.com/p/c/", "bob", None, "2025-09-02T09:00:00Z")
+    # duplicate row is ignored by the UNIQUE constraint and must not be counted
+    insert(db_path, "https://www.instagram.com/p/a/", "alice", 60, "2025-09-03T10:00:00Z")
+
+    stats = fetch_stats(db_path=db_path)
+    assert stats["totals"]["items"] == 3
+    assert stats["totals"]["total_seconds"] == 90
+    assert {r["author"]: r["items"] for r in stats["by_author"]} == {"alice": 2, "bob": 1}
+    assert {(r["day"], r["author"]): r["items"] for r in stats["daily"]} == {
+        ("2025-09-01", "alice"): 2,
+        ("2025-09-02", "bob"): 1,
+    }
+
+    conn = sqlite3.connect(db_path)
+    with conn:
+        conn.execute("DELETE FROM ingested_content WHERE author = 'bob'")
+    conn.close()
+    stats = fetch_stats(db_path=db_path)
+    assert [r["author"] for r in stats["by_author"]] == ["alice"]
+
+
+def test_rebuild_matches_incremental(tmp_path, insert):
+    db_path = tmp_path / "content.db"
+    insert(db_path, "https://www.instagram.com/p/a/", "alice", 60, "2025-09-01T10:00:00Z")
+    insert(db_path, "https://www.instagram.com/p/b/", "bob", 15, "2025-09-02T10:00:00Z")
+    before = fetch_stats(db_path=db_path)
+    conn = sqlite3.connect(db_path)
+    rebuild_stats(conn)
+    conn.close()
+    assert fetch_stats(db_path=db_path) == before
+
+
+def test_rebuild_cli_on_empty_database(tmp_path):
+    db_path = tmp_path / "content.db"
+    stats_main(["--rebuild", "--db", str(db_path)])
+    assert fetch_stats(db_path=db_path)["totals"]["items"] == 0
@@ -0,0 +1,65 @@
+import asyncio
+import json
+
+from backend.tracing import span, start_trace, traced
+
+
+@traced("work", cat="test")
+def _work():
+    with span("inner", cat="test") as sp:
+        sp["items"] = 3
+
+
+def test_spans_follow_to_thread_and_export(tmp_path):
+    async def run():
+        with start_trace("run:test") as trace:
+            await asyncio.to_thread(_work)
+        return trace
+
+    trace = asyncio.run(run())
+    path = trace.write(tmp_path / "trace.json")
+    events = json.loads(path.read_text())["traceEvents"]
+    complete = {e["name"]: e for e in events if e["ph"] == "X"}
+    assert set(complete) == {"run:test", "work", "inner"}
+    assert complete["inner"]["args"] == {"items": 3}
+    outer, inner = complete["run:test"], complete["inner"]
+    assert outer["ts"] <= inner["ts"] and inner["ts"] + inner["dur"] <= outer["ts"] + outer["dur"]
+
+
+def test_span_without_trace_is_noop():
+    with span("orphan") as sp:
+        sp["x"] = 1
+    _work()
+
+
+def test_write_keeps_only_newest_traces(tmp_path):
+    import os
+
+    for i in range(5):
+        with start_trace(f"run:{i}") as trace:
+            pass
+        path = trace.write(tmp_path / f"run_{i}.json", keep=3)
+        os.utime(path, (i, i))
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["run_2.json", "run_3.json", "run_4.json"]
+
+
+def test_scheduled_scrape_writes_a_trace(tmp_path, monkeypatch):
+    import sqlite3
+
+    from backend.db.db import find_ingested_urls
+    from backend.ingestion.scheduler import scheduler_app
+
+    def fake_scrape(username, **kwargs):
+        find_ingested_urls(["https://www.instagram.com/p/x/"], db_path=tmp_path / "content.db")
+        return []
+
+    monkeypatch.setattr(scheduler_app, "scrape_account", fake_scrape)
+    monkeypatch.setattr(scheduler_app, "get_connection", lambda: sqlite3.connect(tmp_path / "posts.db"))
+    monkeypatch.setattr(scheduler_app, "TRACE_DIR", tmp_path / "traces")
+
+    scheduler_app.scrape_account_job("someuser")
+
+    (path,) = (tmp_path / "traces").iterdir()
+    assert path.name.startswith("someuser_")
+    names = {e["name"] for e in json.loads(path.read_text())["traceEvents"] if e["ph"] == "X"}
+    assert {"scrape:someuser", "find_ingested_urls"} <= names